@@ -3,7 +3,7 @@ from django.utils.html import format_html
 from .models import (
     OwnerUser, ConsumerUser,
     OwnerRefreshToken, ConsumerRefreshToken,
-    PhoneVerification
+    PhoneVerification, SmsOutbox
 )
 from common.s3 import generate_presigned_url
 
@@ -72,3 +72,13 @@ class PhoneVerificationAdmin(admin.ModelAdmin):
     list_filter = ("is_verified", "created_at", "expires_at")
     search_fields = ("phone_number", "code")
     ordering = ("-created_at",)
+
+
+@admin.register(SmsOutbox)
+class SmsOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "id", "phone_number", "status", "attempts", "message_id", "created_at", "sent_at"
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("phone_number", "message_id")
+    ordering = ("-created_at",)
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from stores.models import Store, new_claims_version
+from .models import OwnerUser, ConsumerUser
+
+
+USER_MODELS = {
+    "owner": OwnerUser,
+    "consumer": ConsumerUser,
+}
+
+# 캐시(공유 캐시일 수 있음)에 올리지 않는 필드. 필요할 때(비밀번호 확인 등)만 DB 에서 읽힌다.
+UNCACHED_FIELDS = {
+    "owner": ("password",),
+    "consumer": (),
+}
+
+
+def user_cache_key(role: str, user_id) -> str:
+    return f"auth:user:{role}:{user_id}"
+
+
+def get_cached_user(role: str, user_id):
+    """
+    (role, user_id) 로 사용자를 조회한다. 캐시에 없으면 DB에서 읽어 채운다.
+    존재하지 않는 사용자는 캐시하지 않고 DoesNotExist 를 그대로 올린다.
+    비밀번호 해시는 캐시에 넣지 않는다 (UNCACHED_FIELDS).
+    """
+    model = USER_MODELS[role]
+    key = user_cache_key(role, user_id)
+
+    user = cache.get(key)
+    if user is None:
+        user = model.objects.defer(*UNCACHED_FIELDS[role]).get(id=user_id)
+        cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(role: str, user_id):
+    cache.delete(user_cache_key(role, user_id))
+
+
+def claims_version_key(store_id) -> str:
+    return f"auth:claims-version:{store_id}"
+
+
+def get_claims_version(store_id, refresh=False):
+    """
+    가게별 토큰 클레임 버전. 원본은 Store.claims_version 이고 캐시는 사본이라,
+    캐시가 비었거나(cull, 재시작, 다른 워커) refresh=True 이면 DB에서 다시 읽는다.
+    가게가 없으면 None.
+    """
+    key = claims_version_key(store_id)
+    version = None if refresh else cache.get(key)
+    if version is None:
+        version = Store.objects.filter(id=store_id).values_list("claims_version", flat=True).first()
+        if version is not None:
+            cache.set(key, version, settings.AUTH_USER_CACHE_TIMEOUT)
+    return version
+
+
+def bump_claims_version(store_id):
+    """
+    DB의 버전을 바꾸고 캐시 사본을 지운다. 커밋 전에 다른 요청이 옛 값을
+    다시 캐시했을 수 있으므로 커밋 후에 한 번 더 지운다.
+    """
+    key = claims_version_key(store_id)
+    Store.objects.filter(id=store_id).update(claims_version=new_claims_version())
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,89 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import OwnerRefreshToken, ConsumerRefreshToken, PhoneVerification, SmsOutbox
+from common.enums import SmsStatus
+
+
+class Command(BaseCommand):
+    help = "만료/폐기된 리프레시 토큰, 지난 휴대폰 인증 내역, 처리 끝난 발송 문자를 pk 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 삭제할 행 수")
+        parser.add_argument("--sleep", type=float, default=0.1, help="배치 사이 대기 시간(초)")
+        parser.add_argument(
+            "--verification-grace",
+            type=int,
+            default=10,
+            help="인증 내역은 만료 후 이 시간(분)이 지나야 삭제 (소비자 로그인 확인용 여유)",
+        )
+        parser.add_argument(
+            "--outbox-retention",
+            type=int,
+            default=60,
+            help="발송 완료/실패 문자는 적재 후 이 시간(분)이 지나면 삭제 (본문에 인증번호가 들어 있음)",
+        )
+        parser.add_argument("--daemon", action="store_true", help="주기적으로 계속 실행")
+        parser.add_argument("--interval", type=int, default=3600, help="daemon 모드 실행 간격(초)")
+
+    def handle(self, *args, **options):
+        while True:
+            self.purge(options)
+            if not options["daemon"]:
+                return
+            time.sleep(options["interval"])
+
+    def purge(self, options):
+        now = timezone.now()
+        verification_cutoff = now - timedelta(minutes=options["verification_grace"])
+        outbox_cutoff = now - timedelta(minutes=options["outbox_retention"])
+
+        targets = [
+            ("OwnerRefreshToken", OwnerRefreshToken.objects.filter(Q(revoked=True) | Q(expires_at__lte=now))),
+            ("ConsumerRefreshToken", ConsumerRefreshToken.objects.filter(Q(revoked=True) | Q(expires_at__lte=now))),
+            ("PhoneVerification", PhoneVerification.objects.filter(expires_at__lte=verification_cutoff)),
+            # 대기/발송 중인 문자는 워커가 처리해야 하므로 남겨 둔다
+            ("SmsOutbox", SmsOutbox.objects.filter(
+                status__in=[SmsStatus.SENT.value, SmsStatus.FAILED.value],
+                created_at__lte=outbox_cutoff,
+            )),
+        ]
+
+        for label, queryset in targets:
+            started = time.monotonic()
+            deleted = self.delete_in_batches(queryset, options["batch_size"], options["sleep"])
+            elapsed = time.monotonic() - started
+            rate = deleted / elapsed if elapsed > 0 else 0
+
+            self.stdout.write(f"{label}: {deleted}건 삭제 ({elapsed:.1f}s, {rate:.0f} rows/s)")
+
+    def delete_in_batches(self, queryset, batch_size, sleep):
+        """
+        pk 오름차순으로 batch_size 개씩 끊어서 삭제한다.
+        배치마다 짧은 트랜잭션으로 끝나므로 테이블 잠금이 길게 유지되지 않는다.
+        삭제할 때도 원래 조건을 다시 걸어, 조회 이후 갱신된 행(새 인증번호 등)은 남긴다.
+        """
+        total = 0
+        last_pk = 0
+
+        while True:
+            ids = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return total
+
+            deleted, _ = queryset.filter(pk__in=ids).delete()
+            total += deleted
+            last_pk = ids[-1]
+
+            if len(ids) < batch_size:
+                return total
+            if sleep:
+                time.sleep(sleep)
@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from requests import RequestException
+
+from accounts.models import SmsOutbox
+from common.enums import SmsStatus
+from common.solapi import SolapiClient, SolapiError
+
+
+class Command(BaseCommand):
+    help = "SmsOutbox 에 쌓인 문자를 모아 Solapi send-many 요청으로 발송합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="요청 1회에 담을 최대 문자 수")
+        parser.add_argument(
+            "--window",
+            type=float,
+            default=0.5,
+            help="첫 문자가 쌓인 뒤 배치를 채우려고 기다리는 최대 시간(초)",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="대기 문자가 없을 때 쉬는 시간(초)")
+        parser.add_argument("--max-attempts", type=int, default=3, help="최대 발송 시도 횟수")
+        parser.add_argument("--stale-after", type=int, default=300, help="발송 중 상태로 이 시간(초)이 지나면 다시 대기로")
+        parser.add_argument("--once", action="store_true", help="대기 문자를 한 번만 처리하고 종료")
+
+    def handle(self, *args, **options):
+        client = SolapiClient()
+        try:
+            while True:
+                self.requeue_stale(options["stale_after"])
+                batch = self.collect(options["batch_size"], options["window"])
+
+                if batch:
+                    self.deliver(client, batch, options["max_attempts"])
+
+                if options["once"] and len(batch) < options["batch_size"]:
+                    return
+                if not batch:
+                    time.sleep(options["poll_interval"])
+        finally:
+            client.close()
+
+    def collect(self, batch_size, window):
+        """
+        배치가 가득 차거나, 가장 오래된 문자가 window 초를 채울 때까지 모은다.
+        """
+        batch = self.claim(batch_size)
+        if not batch or len(batch) >= batch_size or window <= 0:
+            return batch
+
+        remaining = (batch[0].created_at + timedelta(seconds=window) - timezone.now()).total_seconds()
+        if remaining > 0:
+            time.sleep(remaining)
+            batch += self.claim(batch_size - len(batch))
+        return batch
+
+    def claim(self, limit):
+        """
+        대기 문자를 발송 중으로 바꿔 가져온다. (여러 워커가 같은 행을 잡지 않도록 skip_locked)
+        """
+        with transaction.atomic():
+            ids = list(
+                SmsOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status=SmsStatus.PENDING.value)
+                .order_by("id")
+                .values_list("id", flat=True)[:limit]
+            )
+            SmsOutbox.objects.filter(id__in=ids).update(
+                status=SmsStatus.SENDING.value,
+                claimed_at=timezone.now(),
+            )
+        return list(SmsOutbox.objects.filter(id__in=ids).order_by("id"))
+
+    def requeue_stale(self, stale_after):
+        SmsOutbox.objects.filter(
+            status=SmsStatus.SENDING.value,
+            claimed_at__lt=timezone.now() - timedelta(seconds=stale_after),
+        ).update(status=SmsStatus.PENDING.value)
+
+    def deliver(self, client, batch, max_attempts):
+        now = timezone.now()
+        for outbox in batch:
+            outbox.attempts += 1
+
+        try:
+            results = client.send_many([(o.id, o.phone_number, o.text) for o in batch])
+        except (SolapiError, RequestException) as e:
+            # 네트워크 오류나 Solapi 5xx 는 시도 횟수가 남아 있으면 다시 대기, 그 외는 실패
+            retryable = getattr(e, "retryable", True)
+            for outbox in batch:
+                outbox.error_message = str(e)
+                outbox.status = (
+                    SmsStatus.PENDING.value
+                    if retryable and outbox.attempts < max_attempts
+                    else SmsStatus.FAILED.value
+                )
+        else:
+            # 메시지별 결과 (잘못된 번호 등 개별 실패는 재시도하지 않고,
+            # 응답에서 결과를 찾지 못한 메시지만 시도 횟수 안에서 다시 대기)
+            for outbox in batch:
+                result = results[str(outbox.id)]
+                outbox.message_id = result.message_id
+                if result.ok:
+                    outbox.status = SmsStatus.SENT.value
+                    outbox.error_message = None
+                    outbox.sent_at = now
+                else:
+                    outbox.status = (
+                        SmsStatus.PENDING.value
+                        if result.retryable and outbox.attempts < max_attempts
+                        else SmsStatus.FAILED.value
+                    )
+                    outbox.error_message = result.error
+
+        SmsOutbox.objects.bulk_update(
+            batch, ["status", "attempts", "message_id", "error_message", "sent_at"]
+        )
+
+        sent = sum(1 for o in batch if o.status == SmsStatus.SENT.value)
+        self.stdout.write(f"{len(batch)}건 중 {sent}건 발송 완료")
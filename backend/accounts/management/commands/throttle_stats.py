@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.throttling import get_throttle_stats, is_process_local_cache, reset_throttle_stats, throttle_rates
+
+
+class Command(BaseCommand):
+    help = "요청 제한(scope)별 허용/거절 누적 횟수를 출력합니다. (공유 캐시를 쓸 때만 의미가 있음)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="출력 후 카운터 초기화")
+
+    def handle(self, *args, **options):
+        # 프로세스 로컬 캐시면 이 명령은 자기 빈 캐시만 읽는다
+        if is_process_local_cache():
+            raise CommandError(
+                "기본 캐시가 프로세스 로컬(LocMem)이라 웹 프로세스의 카운터를 읽을 수 없습니다. "
+                "CACHE_BACKEND 로 공유 캐시를 지정하거나 /api/v1/accounts/throttle-stats/ 를 사용하세요."
+            )
+
+        rates = throttle_rates()
+        stats = get_throttle_stats(rates.keys())
+
+        for scope, counts in stats.items():
+            total = counts["hit"] + counts["deny"]
+            deny_rate = counts["deny"] / total * 100 if total else 0
+            self.stdout.write(
+                f"{scope:<20} {rates[scope]:>10}  hit={counts['hit']}  deny={counts['deny']}  ({deny_rate:.1f}% 거절)"
+            )
+
+        if options["reset"]:
+            reset_throttle_stats(rates.keys())
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:00
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_token_hash(apps, schema_editor):
+    # 이미 해시가 채워진 행은 건너뛴다 (재실행해도 결과가 같다)
+    for model_name in ("OwnerRefreshToken", "ConsumerRefreshToken"):
+        model = apps.get_model("accounts", model_name)
+        for row in model.objects.filter(token_hash__isnull=True).only("id", "token").iterator():
+            row.token_hash = hashlib.sha256(row.token.encode()).hexdigest()
+            row.save(update_fields=["token_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_alter_owneruser_business_license_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ownerrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="consumerrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_token_hash, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="ownerrefreshtoken",
+            name="token",
+        ),
+        migrations.RemoveField(
+            model_name="consumerrefreshtoken",
+            name="token",
+        ),
+        migrations.AlterField(
+            model_name="ownerrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="consumerrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
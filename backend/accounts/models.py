@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from common.enums import SmsStatus
 
 
 class OwnerUserManager(BaseUserManager):
@@ -69,7 +70,7 @@ class ConsumerUser(models.Model):
 
 class OwnerRefreshToken(models.Model):
     user = models.ForeignKey("accounts.OwnerUser", on_delete=models.CASCADE)
-    token = models.TextField()
+    token_hash = models.CharField(max_length=64, unique=True)  # sha256(refresh token)
     device_info = models.CharField(max_length=255)
     
     revoked = models.BooleanField(default=False)
@@ -82,7 +83,7 @@ class OwnerRefreshToken(models.Model):
 
 class ConsumerRefreshToken(models.Model):
     user = models.ForeignKey("accounts.ConsumerUser", on_delete=models.CASCADE)
-    token = models.TextField()
+    token_hash = models.CharField(max_length=64, unique=True)  # sha256(refresh token)
     device_info = models.CharField(max_length=255)
 
     revoked = models.BooleanField(default=False)
@@ -105,3 +106,33 @@ class PhoneVerification(models.Model):
 
     def __str__(self):
         return f"{self.phone_number} ({'verified' if self.is_verified else 'pending'})"
+
+
+
+class SmsOutbox(models.Model):
+    """
+    발송 대기 문자. 요청 처리 중에는 적재만 하고 run_sms_worker 가 Solapi로 보낸다.
+    """
+    phone_number = models.CharField(max_length=20)
+    text = models.TextField()
+
+    status = models.CharField(
+        max_length=10,
+        choices=SmsStatus.choices(),
+        default=SmsStatus.PENDING.value
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    message_id = models.CharField(max_length=64, blank=True, null=True)
+    error_message = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"SMS to {self.phone_number} ({self.get_status_display()})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"]),
+        ]
@@ -10,7 +10,8 @@ from datetime import timedelta, timezone
 from django.utils import timezone
 from jwt import decode as jwt_decode
 from django.conf import settings
-from common.utils import generate_temp_password
+from common.utils import generate_temp_password, hash_token
+from config.auth import add_owner_claims
 
 
 class RequestCodeSerializer(serializers.Serializer):
@@ -109,11 +110,12 @@ class OwnerLoginSerializer(serializers.Serializer):
         refresh["role"] = "owner"
         access = refresh.access_token
         access["role"] = "owner"
+        add_owner_claims(access, user)
 
         # DB에 refresh 저장
         OwnerRefreshToken.objects.create(
             user=user,
-            token=str(refresh),
+            token_hash=hash_token(str(refresh)),
             device_info=device_info,
             expires_at=timezone.now() + timedelta(days=30)  # 30일 유효
         )
@@ -147,14 +149,14 @@ class RefreshTokenSerializer(serializers.Serializer):
             if role == "owner":
                 token_obj = OwnerRefreshToken.objects.filter(
                     user_id=user_id,
-                    token=refresh_token,
+                    token_hash=hash_token(refresh_token),
                     revoked=False,
                     expires_at__gt=timezone.now()
                 ).first()
             elif role == "consumer":
                 token_obj = ConsumerRefreshToken.objects.filter(
                     user_id=user_id,
-                    token=refresh_token,
+                    token_hash=hash_token(refresh_token),
                     revoked=False,
                     expires_at__gt=timezone.now()
                 ).first()
@@ -167,6 +169,8 @@ class RefreshTokenSerializer(serializers.Serializer):
             # 3. access token 재발급
             access = AccessToken.for_user(token_obj.user)
             access["role"] = role
+            if role == "owner":
+                add_owner_claims(access, token_obj.user)
 
             return {
                 "access": str(access)
@@ -196,7 +200,7 @@ class LogoutSerializer(serializers.Serializer):
 
             token_obj = model.objects.filter(
                 user_id=user_id,
-                token=refresh_token,
+                token_hash=hash_token(refresh_token),
                 revoked=False,
                 expires_at__gt=timezone.now()
             ).first()
@@ -354,7 +358,7 @@ class ConsumerLoginSerializer(serializers.Serializer):
         # 4. DB에 refresh 저장
         ConsumerRefreshToken.objects.create(
             user=user,
-            token=str(refresh),
+            token_hash=hash_token(str(refresh)),
             device_info=device_info,
             expires_at=timezone.now() + timedelta(days=30),
         )
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from stores.models import Store
+from partnerships.models import Partnership
+from .models import OwnerUser, ConsumerUser
+from .cache import invalidate_user, bump_claims_version
+
+
+# 사용자 정보(is_active, is_verified, 비밀번호 등)가 바뀌면 인증 캐시를 비운다.
+# QuerySet.update() 는 시그널을 보내지 않으므로 사용자 상태 변경은 save() 로 한다.
+
+@receiver([post_save, post_delete], sender=OwnerUser)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    invalidate_user("owner", instance.pk)
+
+    # 로그인 시각 갱신은 토큰 클레임과 무관하다
+    update_fields = kwargs.get("update_fields")
+    if not settings.OWNER_TOKEN_CLAIMS:
+        return
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+
+    store_id = Store.objects.filter(owner_id=instance.pk).values_list("id", flat=True).first()
+    if store_id is not None:
+        bump_claims_version(store_id)
+
+
+@receiver([post_save, post_delete], sender=ConsumerUser)
+def invalidate_consumer_cache(sender, instance, **kwargs):
+    invalidate_user("consumer", instance.pk)
+
+
+# 가게 또는 제휴가 바뀌면 기존 클레임 토큰을 무효화한다.
+
+@receiver([post_save, post_delete], sender=Store)
+def bump_store_claims(sender, instance, **kwargs):
+    if not settings.OWNER_TOKEN_CLAIMS:
+        return
+    bump_claims_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Partnership)
+def bump_partnership_claims(sender, instance, **kwargs):
+    if not settings.OWNER_TOKEN_CLAIMS:
+        return
+    bump_claims_version(instance.store_a_id)
+    bump_claims_version(instance.store_b_id)
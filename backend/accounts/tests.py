@@ -1,3 +1,542 @@
-from django.test import TestCase
+import hashlib
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, migrations
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.cache import claims_version_key, get_cached_user, user_cache_key
+from accounts.models import (
+    ConsumerRefreshToken,
+    ConsumerUser,
+    OwnerRefreshToken,
+    OwnerUser,
+    PhoneVerification,
+    SmsOutbox,
+)
+from common.enums import SmsStatus
+from common.solapi_stub import SolapiStubServer
+from common.throttling import ClientIPThrottle, SlidingWindowThrottle, get_throttle_stats
+from common.utils import hash_token
+from config.auth import get_owner_principal
+from partnerships.models import Partnership
+from stores.models import Store
+
+
+class SmsOutboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.stub = SolapiStubServer().start()
+        self.addCleanup(self.stub.stop)
+
+    def run_worker(self, **options):
+        with override_settings(SOLAPI_BASE_URL=self.stub.url):
+            call_command("run_sms_worker", once=True, window=0, stdout=StringIO(), **options)
+
+    def test_request_code_enqueues_and_worker_delivers(self):
+        response = self.client.post(
+            "/api/v1/accounts/phone-verify-request/",
+            {"phone_number": "01012345678"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        outbox = SmsOutbox.objects.get()
+        self.assertEqual(outbox.status, SmsStatus.PENDING.value)
+        self.assertEqual(self.stub.messages, [])
+
+        self.run_worker()
+
+        outbox.refresh_from_db()
+        code = PhoneVerification.objects.get(phone_number="01012345678").code
+        self.assertEqual(outbox.status, SmsStatus.SENT.value)
+        self.assertIsNotNone(outbox.message_id)
+        self.assertEqual(self.stub.messages[0]["to"], "01012345678")
+        self.assertIn(code, self.stub.messages[0]["text"])
+
+    def test_pending_messages_are_sent_in_one_request(self):
+        self.stub.fail_numbers.add("01000000000")
+        ok_a = SmsOutbox.objects.create(phone_number="01011111111", text="a")
+        bad = SmsOutbox.objects.create(phone_number="01000000000", text="b")
+        ok_b = SmsOutbox.objects.create(phone_number="01022222222", text="c")
+
+        self.run_worker()
+
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(len(self.stub.messages), 3)
+
+        statuses = dict(SmsOutbox.objects.values_list("id", "status"))
+        self.assertEqual(statuses[ok_a.id], SmsStatus.SENT.value)
+        self.assertEqual(statuses[bad.id], SmsStatus.FAILED.value)
+        self.assertEqual(statuses[ok_b.id], SmsStatus.SENT.value)
+
+    def test_rejected_number_is_marked_failed(self):
+        self.stub.fail_numbers.add("01000000000")
+        outbox = SmsOutbox.objects.create(phone_number="01000000000", text="hello")
+
+        self.run_worker()
+
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, SmsStatus.FAILED.value)
+        self.assertEqual(outbox.attempts, 1)
+
+    def test_results_matched_by_number_without_custom_fields(self):
+        self.stub.echo_custom_fields = False
+        self.stub.fail_numbers.add("01000000000")
+        ok = SmsOutbox.objects.create(phone_number="010-1111-1111", text="a")
+        bad = SmsOutbox.objects.create(phone_number="01000000000", text="b")
+
+        self.run_worker()
+
+        statuses = dict(SmsOutbox.objects.values_list("id", "status"))
+        self.assertEqual(statuses[ok.id], SmsStatus.SENT.value)
+        self.assertEqual(statuses[bad.id], SmsStatus.FAILED.value)
+
+    def test_missing_result_is_retried_not_marked_sent(self):
+        self.stub.echo_custom_fields = False
+        self.stub.drop_numbers.add("01012345678")
+        outbox = SmsOutbox.objects.create(phone_number="01012345678", text="hello")
+
+        self.run_worker(max_attempts=2)
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, SmsStatus.PENDING.value)
+        self.assertIsNone(outbox.sent_at)
+
+        self.run_worker(max_attempts=2)
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, SmsStatus.FAILED.value)
+
+    def test_server_error_is_retried_until_max_attempts(self):
+        self.stub.status_code = 503
+        outbox = SmsOutbox.objects.create(phone_number="01012345678", text="hello")
+
+        self.run_worker(max_attempts=2)
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, SmsStatus.PENDING.value)
+
+        self.run_worker(max_attempts=2)
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, SmsStatus.FAILED.value)
+        self.assertEqual(outbox.attempts, 2)
+
+
+class AuthUserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = OwnerUser.objects.create_user(username="owner1", password="pw", name="사장님")
+        self.consumer = ConsumerUser.objects.create(kakao_id="kakao-1", phone_number="01012345678")
+        cache.clear()
+
+    def test_second_lookup_hits_cache(self):
+        with self.assertNumQueries(1):
+            get_cached_user("owner", self.owner.id)
+        with self.assertNumQueries(0):
+            user = get_cached_user("owner", self.owner.id)
+        self.assertEqual(user.username, "owner1")
+
+    def test_password_hash_is_not_cached(self):
+        get_cached_user("owner", self.owner.id)
+        cached = cache.get(user_cache_key("owner", self.owner.id))
+        self.assertIn("password", cached.get_deferred_fields())
+
+        # 필요할 때는 DB 에서 읽는다
+        user = get_cached_user("owner", self.owner.id)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("pw"))
+
+    def test_missing_user_is_not_cached(self):
+        with self.assertRaises(OwnerUser.DoesNotExist):
+            get_cached_user("owner", 999999)
+        self.assertIsNone(cache.get(user_cache_key("owner", 999999)))
+
+    def test_owner_save_invalidates(self):
+        get_cached_user("owner", self.owner.id)
+        self.owner.is_active = False
+        self.owner.save()
+
+        self.assertIsNone(cache.get(user_cache_key("owner", self.owner.id)))
+        self.assertFalse(get_cached_user("owner", self.owner.id).is_active)
+
+    def test_owner_delete_invalidates(self):
+        get_cached_user("owner", self.owner.id)
+        owner_id = self.owner.id
+        self.owner.delete()
+
+        with self.assertRaises(OwnerUser.DoesNotExist):
+            get_cached_user("owner", owner_id)
+
+    def test_consumer_save_invalidates(self):
+        get_cached_user("consumer", self.consumer.id)
+        self.consumer.is_active = False
+        self.consumer.save()
+
+        self.assertFalse(get_cached_user("consumer", self.consumer.id).is_active)
+
+    def test_consumer_delete_invalidates(self):
+        get_cached_user("consumer", self.consumer.id)
+        consumer_id = self.consumer.id
+        self.consumer.delete()
+
+        with self.assertRaises(ConsumerUser.DoesNotExist):
+            get_cached_user("consumer", consumer_id)
+
+
+@override_settings(OWNER_TOKEN_CLAIMS=True)
+class OwnerClaimsTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = OwnerUser.objects.create_user(username="owner1", password="pw1234!", name="사장님")
+        self.store = Store.objects.create(
+            owner=self.owner, name="꽃집", phone="0212345678", address="서울시 성동구"
+        )
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            "/api/v1/accounts/owner-login/",
+            {"username": "owner1", "password": "pw1234!", "device_info": "test"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]
+
+    def me(self, access):
+        return self.client.get("/api/v1/accounts/me/", HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_claims_token_survives_cache_loss(self):
+        access = self.login()["access"]
+        self.assertEqual(self.me(access).status_code, 200)
+
+        # cull/재시작/다른 워커: 캐시가 비어도 DB 원본으로 다시 확인한다
+        cache.clear()
+        self.assertEqual(self.me(access).status_code, 200)
+
+    def test_store_change_rejects_old_token(self):
+        tokens = self.login()
+        self.store.name = "새 꽃집"
+        self.store.save()
+
+        self.assertEqual(self.me(tokens["access"]).status_code, 401)
+
+        response = self.client.post("/api/v1/accounts/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.me(response.data["data"]["access"]).status_code, 200)
+
+    def test_stale_cached_version_does_not_reject_new_token(self):
+        cache.set(claims_version_key(self.store.id), "oldversion00")
+        access = self.login()["access"]
+
+        # 다른 워커에 남은 옛 사본 때문에 새 토큰이 거절되면 안 된다
+        cache.set(claims_version_key(self.store.id), "oldversion00")
+        self.assertEqual(self.me(access).status_code, 200)
+
+    def test_last_login_update_keeps_token(self):
+        access = self.login()["access"]
+        self.login()  # last_login 만 갱신
+
+        self.assertEqual(self.me(access).status_code, 200)
+
+
+class OwnerPrincipalQueryTests(TestCase):
+    """
+    OWNER_TOKEN_CLAIMS 가 꺼진 기본 경로는 기존보다 쿼리가 늘어나면 안 된다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = OwnerUser.objects.create_user(username="owner1", password="pw1234!", name="사장님")
+        self.store = Store.objects.create(
+            owner=self.owner, name="꽃집", phone="0212345678", address="서울시 성동구"
+        )
+        other_owner = OwnerUser.objects.create_user(username="owner2", password="pw1234!", name="사장님2")
+        self.partner = Store.objects.create(
+            owner=other_owner, name="빵집", phone="0212345679", address="서울시 성동구"
+        )
+
+    def test_owner_profile_loads_store_once(self):
+        client = APIClient()
+        response = client.post(
+            "/api/v1/accounts/owner-login/",
+            {"username": "owner1", "password": "pw1234!", "device_info": "test"},
+            format="json",
+        )
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['data']['access']}")
+        client.get("/api/v1/accounts/owner-profile/")  # 사용자 캐시 적재
+
+        with self.assertNumQueries(1):
+            response = client.get("/api/v1/accounts/owner-profile/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["store"]["name"], "꽃집")
+
+    def test_active_partnership_without_claims(self):
+        partnership = Partnership.objects.create(
+            store_a=self.store,
+            store_b=self.partner,
+            start_date=timezone.localdate(),
+            slug_for_a="slugfora01",
+            slug_for_b="slugforb01",
+        )
+        request = SimpleNamespace(user=self.owner, auth=None)
+
+        # 가게 1번 + 제휴 1번 (QRCodeView 기존 쿼리 수)
+        with self.assertNumQueries(2):
+            principal = get_owner_principal(request)
+            self.assertEqual(principal.get_active_partnership(), partnership)
+
+    def test_store_save_skips_claims_bump_when_disabled(self):
+        version = self.store.claims_version
+        with self.assertNumQueries(1):
+            self.store.save(update_fields=["phone"])
+
+        self.store.refresh_from_db()
+        self.assertEqual(self.store.claims_version, version)
+
+
+class RefreshTokenHashTests(TestCase):
+    def setUp(self):
+        OwnerUser.objects.create_user(username="owner1", password="pw1234!", name="사장님")
+        self.client = APIClient()
+        response = self.client.post(
+            "/api/v1/accounts/owner-login/",
+            {"username": "owner1", "password": "pw1234!", "device_info": "test"},
+            format="json",
+        )
+        self.refresh = response.data["data"]["refresh"]
+
+    def test_only_hash_is_stored(self):
+        row = OwnerRefreshToken.objects.values().get()
+        self.assertEqual(row["token_hash"], hash_token(self.refresh))
+        self.assertNotIn(self.refresh, [str(value) for value in row.values()])
+
+    def test_hashed_token_validates(self):
+        response = self.client.post("/api/v1/accounts/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data["data"])
+
+    def test_logout_revokes_by_hash(self):
+        response = self.client.post("/api/v1/accounts/logout/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(OwnerRefreshToken.objects.get().revoked)
+
+        response = self.client.post("/api/v1/accounts/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class RefreshTokenHashMigrationTests(TransactionTestCase):
+    migrate_from = ("accounts", "0003_alter_owneruser_business_license_image")
+    migration = ("accounts", "0004_refresh_token_hash")
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        self.addCleanup(self.migrate_to_latest)
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill_is_idempotent(self):
+        executor = MigrationExecutor(connection)
+        state = executor.loader.project_state(self.migrate_from)
+        old_apps = state.apps
+        owner = old_apps.get_model("accounts", "OwnerUser").objects.create(
+            username="owner1", password="x", name="사장님", phone_number="01012345678"
+        )
+        old_apps.get_model("accounts", "OwnerRefreshToken").objects.create(
+            user=owner, token="raw-refresh", device_info="test", expires_at=timezone.now()
+        )
+
+        # 0004 를 연산 단위로 적용하면서 백필(RunPython)만 두 번 돌린다
+        migration = executor.loader.get_migration(*self.migration)
+        with connection.schema_editor() as editor:
+            for operation in migration.operations:
+                new_state = state.clone()
+                operation.state_forwards("accounts", new_state)
+                operation.database_forwards("accounts", editor, state, new_state)
+                if isinstance(operation, migrations.RunPython):
+                    with self.assertNumQueries(2):  # 조회만 하고 다시 쓰지 않는다
+                        operation.database_forwards("accounts", editor, state, new_state)
+                state = new_state
+        executor.recorder.record_applied(*self.migration)
+
+        token_model = state.apps.get_model("accounts", "OwnerRefreshToken")
+        self.assertEqual(
+            list(token_model.objects.values_list("token_hash", flat=True)),
+            [hashlib.sha256(b"raw-refresh").hexdigest()],
+        )
+
+
+class PurgeStaleAuthTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def purge(self, **options):
+        call_command("purge_stale_auth", sleep=0, stdout=StringIO(), **options)
+
+    def verification(self, expires_at):
+        return PhoneVerification.objects.create(phone_number="01012345678", code="123456", expires_at=expires_at)
+
+    def outbox(self, status, age):
+        row = SmsOutbox.objects.create(phone_number="01012345678", text="[NeighBiz] 인증번호 123456", status=status)
+        SmsOutbox.objects.filter(id=row.id).update(created_at=self.now - age)
+        return row
+
+    def test_verification_grace_boundary(self):
+        past_grace = self.verification(self.now - timedelta(minutes=10))
+        within_grace = self.verification(self.now - timedelta(minutes=9, seconds=50))
+        not_expired = self.verification(self.now + timedelta(minutes=3))
+
+        self.purge(verification_grace=10)
+
+        remaining = set(PhoneVerification.objects.values_list("id", flat=True))
+        self.assertEqual(remaining, {within_grace.id, not_expired.id})
+        self.assertNotIn(past_grace.id, remaining)
+
+    def test_verification_refreshed_after_select_is_kept(self):
+        row = self.verification(self.now - timedelta(minutes=30))
+        refreshed = []
+
+        # 배치 조회 직후 사용자가 인증번호를 다시 요청한 상황 (update_or_create 로 같은 행 재사용)
+        def refresh_after_select(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if not refreshed and sql.startswith("SELECT") and "phoneverification" in sql:
+                refreshed.append(True)
+                PhoneVerification.objects.filter(id=row.id).update(
+                    code="654321", expires_at=self.now + timedelta(minutes=3)
+                )
+            return result
+
+        with connection.execute_wrapper(refresh_after_select):
+            self.purge()
+
+        self.assertTrue(refreshed)
+        self.assertEqual(PhoneVerification.objects.get(id=row.id).code, "654321")
+
+    def test_refresh_tokens_revoked_or_expired(self):
+        owner = OwnerUser.objects.create_user(username="owner1", password="pw", name="사장님")
+        consumer = ConsumerUser.objects.create(kakao_id="kakao-1", phone_number="01012345678")
+        expires = self.now + timedelta(days=1)
+
+        live = OwnerRefreshToken.objects.create(user=owner, token_hash="a" * 64, device_info="t", expires_at=expires)
+        OwnerRefreshToken.objects.create(user=owner, token_hash="b" * 64, device_info="t", expires_at=expires, revoked=True)
+        OwnerRefreshToken.objects.create(user=owner, token_hash="c" * 64, device_info="t", expires_at=self.now)
+        ConsumerRefreshToken.objects.create(user=consumer, token_hash="d" * 64, device_info="t", expires_at=self.now)
+
+        self.purge(batch_size=1)
+
+        self.assertEqual(list(OwnerRefreshToken.objects.values_list("id", flat=True)), [live.id])
+        self.assertFalse(ConsumerRefreshToken.objects.exists())
+
+    def test_outbox_retention(self):
+        old_sent = self.outbox(SmsStatus.SENT.value, timedelta(minutes=61))
+        old_failed = self.outbox(SmsStatus.FAILED.value, timedelta(minutes=61))
+        recent_sent = self.outbox(SmsStatus.SENT.value, timedelta(minutes=59))
+        old_pending = self.outbox(SmsStatus.PENDING.value, timedelta(minutes=61))
+
+        self.purge(outbox_retention=60)
+
+        remaining = set(SmsOutbox.objects.values_list("id", flat=True))
+        self.assertEqual(remaining, {recent_sent.id, old_pending.id})
+        self.assertNotIn(old_sent.id, remaining)
+        self.assertNotIn(old_failed.id, remaining)
+
+
+THROTTLE_TEST_RATES = {"test_ip": "3/min"}
+
+
+class ThrottleView:
+    throttle_scope = "test"
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": THROTTLE_TEST_RATES})
+class SlidingWindowThrottleTests(TestCase):
+    start = 60 * 1_000_000  # 구간 시작 시각
+
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+
+    def allow(self, at):
+        with mock.patch("common.throttling.time.time", return_value=at):
+            return ClientIPThrottle().allow_request(self.request, ThrottleView())
+
+    def test_ident_key_is_abstract(self):
+        with self.assertRaises(TypeError):
+            SlidingWindowThrottle()
+
+    def test_limit_within_window(self):
+        self.assertEqual([self.allow(self.start + i) for i in range(4)], [True, True, True, False])
+
+        # 두 구간 뒤에는 직전 구간도 비어 있다
+        self.assertTrue(self.allow(self.start + 120))
+
+    def test_previous_window_is_weighted(self):
+        for i in range(3):
+            self.allow(self.start + 50 + i)
+
+        self.assertFalse(self.allow(self.start + 60))  # 3 * 1.0 + 1 > 3
+        self.assertTrue(self.allow(self.start + 90))  # 3 * 0.5 + 1 <= 3
+
+    def test_denied_requests_do_not_extend_lockout(self):
+        for i in range(3):
+            self.allow(self.start + i)
+        for i in range(20):
+            self.assertFalse(self.allow(self.start + 10 + i))
+
+        # 거절된 요청까지 셌다면 (3 + 20) * 0.5 + 1 로 계속 막힌다
+        self.assertTrue(self.allow(self.start + 90))
+
+    def allow_from(self, remote_addr, forwarded_for=None):
+        headers = {"REMOTE_ADDR": remote_addr}
+        if forwarded_for is not None:
+            headers["HTTP_X_FORWARDED_FOR"] = forwarded_for
+        request = APIRequestFactory().get("/", **headers)
+        with mock.patch("common.throttling.time.time", return_value=self.start):
+            return ClientIPThrottle().allow_request(request, ThrottleView())
+
+    def test_clients_behind_proxy_have_separate_buckets(self):
+        # nginx 가 붙인 X-Forwarded-For: 모든 요청의 REMOTE_ADDR 은 nginx 주소로 같다
+        for _ in range(3):
+            self.assertTrue(self.allow_from("172.18.0.5", "203.0.113.1"))
+        self.assertFalse(self.allow_from("172.18.0.5", "203.0.113.1"))
+
+        self.assertTrue(self.allow_from("172.18.0.5", "203.0.113.2"))
+
+    def test_spoofed_forwarded_for_is_ignored(self):
+        # 클라이언트가 보낸 값 뒤에 nginx 가 실제 접속 주소를 덧붙인다
+        for i in range(3):
+            self.assertTrue(self.allow_from("172.18.0.5", f"198.51.100.{i}, 203.0.113.1"))
+        self.assertFalse(self.allow_from("172.18.0.5", "198.51.100.99, 203.0.113.1"))
+
+    def test_stats_and_reset(self):
+        owner = OwnerUser.objects.create_user(username="admin1", password="pw", name="관리자", is_staff=True)
+        for i in range(5):
+            self.allow(self.start + i)
+        self.assertEqual(get_throttle_stats(["test_ip"]), {"test_ip": {"hit": 3, "deny": 2}})
+
+        client = APIClient()
+        client.force_authenticate(owner)
+        response = client.get("/api/v1/accounts/throttle-stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["test_ip"], {"rate": "3/min", "hit": 3, "deny": 2})
+
+        self.assertEqual(client.delete("/api/v1/accounts/throttle-stats/").status_code, 200)
+        self.assertEqual(get_throttle_stats(["test_ip"]), {"test_ip": {"hit": 0, "deny": 0}})
+
+    def test_stats_endpoint_requires_staff(self):
+        client = APIClient()
+        client.force_authenticate(OwnerUser.objects.create_user(username="owner1", password="pw", name="사장님"))
+        self.assertEqual(client.get("/api/v1/accounts/throttle-stats/").status_code, 403)
+
+    def test_command_refuses_process_local_cache(self):
+        with self.assertRaises(CommandError):
+            call_command("throttle_stats", stdout=StringIO())
@@ -17,4 +17,5 @@ urlpatterns = [
     path("consumer-login/", ConsumerLoginView.as_view(), name="consumer-login"),
     path("me/", MeView.as_view(), name="me"),
     path("check-username/", CheckUsernameView.as_view(), name="check-username"),
+    path("throttle-stats/", ThrottleStatsView.as_view(), name="throttle-stats"),
 ]
\ No newline at end of file
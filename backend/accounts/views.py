@@ -7,16 +7,25 @@ from datetime import timedelta
 
 from .serializers import *
 from stores.serializers import StoreProfileSerializer
-from stores.models import Store
-from accounts.models import PhoneVerification
+from django.db import transaction
+from accounts.models import PhoneVerification, SmsOutbox
 from common.response import success, failure
 from common.utils import generate_verification_code
-from common.solapi import send_sms
+from config.auth import get_owner_principal
+from common.throttling import (
+    PhoneNumberThrottle,
+    ClientIPThrottle,
+    get_throttle_stats,
+    reset_throttle_stats,
+    throttle_rates,
+)
 
 
 
 class RequestCodeView(APIView):
     permission_classes = []  # 토큰 요구 X
+    throttle_classes = [PhoneNumberThrottle, ClientIPThrottle]
+    throttle_scope = "daily_phone"
 
     def post(self, request):
         serializer = RequestCodeSerializer(data=request.data)
@@ -33,34 +42,29 @@ class RequestCodeView(APIView):
         code = generate_verification_code()
         expires_at = timezone.now() + timedelta(minutes=5)
 
-        try:
-            message = f"[NeighBiz] 인증번호는 [{code}]입니다."
-            send_sms(phone_number, message)
-        except Exception as e:
-            return Response(
-                failure(
-                    message="인증번호 전송에 실패했습니다.",
-                    data={"error": str(e)},
-                    error_code="SMS_SEND_FAILED"
-                ),
-                status=500
+        # 실제 발송은 run_sms_worker 가 처리 (요청 스레드는 적재만 하고 바로 응답)
+        with transaction.atomic():
+            PhoneVerification.objects.update_or_create(
+                phone_number=phone_number,
+                defaults={
+                    "code": code,
+                    "expires_at": expires_at,
+                    "is_verified": False,
+                    "verified_at": None,
+                }
+            )
+            SmsOutbox.objects.create(
+                phone_number=phone_number,
+                text=f"[NeighBiz] 인증번호는 [{code}]입니다.",
             )
-
-        PhoneVerification.objects.update_or_create(
-            phone_number=phone_number,
-            defaults={
-                "code": code,
-                "expires_at": expires_at,
-                "is_verified": False,
-                "verified_at": None,
-            }
-        )
 
         return Response(success(message="인증번호가 발송되었습니다."))
     
 
 class VerifyCodeView(APIView):
     permission_classes = []  # 토큰 요구 X
+    throttle_classes = [PhoneNumberThrottle, ClientIPThrottle]
+    throttle_scope = "verify_phone"
 
     def post(self, request):
         serializer = VerifyCodeSerializer(data=request.data)
@@ -266,9 +270,8 @@ class OwnerProfileView(APIView):
 
     def get(self, request):
         user = request.user
-        try:
-            store = Store.objects.get(owner=user)
-        except Store.DoesNotExist:
+        store = get_owner_principal(request).store
+        if store is None:
             return Response(
                 failure(message="가게 정보가 존재하지 않습니다."),
                 status=status.HTTP_404_NOT_FOUND,
@@ -282,6 +285,9 @@ class OwnerProfileView(APIView):
 
 
 class ConsumerLoginView(APIView):
+    throttle_classes = [PhoneNumberThrottle, ClientIPThrottle]
+    throttle_scope = "consumer_login"
+
     def post(self, request):
         serializer = ConsumerLoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -357,3 +363,40 @@ class CheckUsernameView(APIView):
             ),
             status=status.HTTP_200_OK
         )
+
+
+class ThrottleStatsView(APIView):
+    """
+    요청 제한(scope)별 허용/거절 누적 횟수 (스태프 전용).
+    캐시가 프로세스 로컬이면 카운터가 웹 프로세스에만 있으므로 여기서 조회/초기화한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def check_staff(self, request):
+        if getattr(request.user, "is_staff", False):
+            return None
+        return Response(
+            failure(
+                message="서버와의 문제가 발생했습니다.",
+                data={"global": "스태프 계정만 접근할 수 있습니다."}
+            ),
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    def get(self, request):
+        denied = self.check_staff(request)
+        if denied:
+            return denied
+
+        rates = throttle_rates()
+        stats = get_throttle_stats(rates.keys())
+        data = {scope: {"rate": rates[scope], **counts} for scope, counts in stats.items()}
+        return Response(success(message="요청 제한 통계를 조회했습니다.", data=data))
+
+    def delete(self, request):
+        denied = self.check_staff(request)
+        if denied:
+            return denied
+
+        reset_throttle_stats(throttle_rates().keys())
+        return Response(success(message="요청 제한 통계를 초기화했습니다."))
@@ -104,3 +104,20 @@ class PartnershipChangeType(str, Enum):
             (cls.EXTEND.value, "연장 요청"),
             (cls.TERMINATE.value, "중도 종료 요청"),
         ]
+
+
+
+class SmsStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    @classmethod
+    def choices(cls):
+        return [
+            (cls.PENDING.value, "발송 대기"),
+            (cls.SENDING.value, "발송 중"),
+            (cls.SENT.value, "발송 완료"),
+            (cls.FAILED.value, "발송 실패"),
+        ]
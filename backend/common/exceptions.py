@@ -1,12 +1,21 @@
 import traceback
 
 from rest_framework.views import exception_handler
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 from common.response import failure
 
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
+    if isinstance(exc, Throttled):
+        return Response(failure(
+            message="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            error_code="THROTTLED"
+        ), status=response.status_code, headers={
+            key: value for key, value in response.items() if key == "Retry-After"
+        })
+
     if response is not None:
         return Response(failure(
             message="입력값이 유효하지 않습니다." if response.status_code == 400 else str(exc),
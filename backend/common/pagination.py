@@ -0,0 +1,137 @@
+import base64
+import binascii
+import json
+import math
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+AFTER = "after"
+BEFORE = "before"
+
+
+def encode_cursor(values, direction=AFTER):
+    """
+    정렬 키 값 목록 + 방향 → URL 에 그대로 실을 수 있는 불투명 문자열
+    """
+    raw = json.dumps({
+        "d": direction,
+        "v": [v.isoformat() if hasattr(v, "isoformat") else v for v in values],
+    })
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _is_cursor_value(value):
+    """
+    커서에 담길 수 있는 값: None, 문자열, 유한한 64비트 범위 숫자 (bool 제외)
+    """
+    if value is None or isinstance(value, str):
+        return True
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return math.isfinite(value) and abs(value) < 2 ** 63
+
+
+def decode_cursor(cursor, size=None):
+    """
+    → (방향, 값 목록). 잘못된 커서면 None
+    값 목록은 스칼라만 허용하고, size 가 주어지면 길이도 맞아야 한다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("d") not in (AFTER, BEFORE):
+        return None
+
+    values = payload.get("v")
+    if not isinstance(values, list) or not all(_is_cursor_value(v) for v in values):
+        return None
+    if size is not None and len(values) != size:
+        return None
+    return payload["d"], values
+
+
+class KeysetPaginator:
+    """
+    (정렬 키..., id) 기준 키셋 페이지네이션.
+    OFFSET/COUNT(*) 없이 "마지막으로 본 행 다음"부터 읽으므로 깊은 페이지도 비용이 같다.
+    ordering 은 모두 같은 방향이어야 하고 마지막 필드는 유일해야 한다. 예: ("-issued_at", "-id")
+    """
+
+    def __init__(self, ordering, page_size=20, max_page_size=100):
+        self.ordering = ordering
+        self.fields = [field.lstrip("-") for field in ordering]
+        self.descending = ordering[0].startswith("-")
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get("page_size", self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def seek(self, values, direction):
+        """
+        (a, b) < (va, vb) 를 a < va OR (a = va AND b < vb) 로 펼친다 (인덱스 범위 조건으로 쓰이도록)
+        정렬 방향으로 "다음"이면 after, 거꾸로 "이전"이면 before.
+        """
+        lookup = "lt" if self.descending == (direction == AFTER) else "gt"
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            equal = {self.fields[j]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{f"{field}__{lookup}": values[i]})
+        return condition
+
+    def cursor_for(self, row, direction):
+        return encode_cursor([getattr(row, field) for field in self.fields], direction)
+
+    def paginate(self, queryset, request):
+        """
+        → (이번 페이지 행 목록, 다음 커서, 이전 커서). 커서가 없으면 None. 잘못된 커서면 ValueError
+        """
+        page_size = self.get_page_size(request)
+        direction, values = AFTER, None
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            decoded = decode_cursor(cursor, size=len(self.fields))
+            if decoded is None:
+                raise ValueError("invalid cursor")
+            direction, values = decoded
+
+        if direction == BEFORE:
+            # 이전 페이지는 거꾸로 읽은 뒤 뒤집는다
+            queryset = queryset.order_by(*[f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if values is not None:
+            # 필드 타입에 맞지 않는 값 (예: 날짜 자리에 숫자) 도 잘못된 커서로 본다
+            try:
+                queryset = queryset.filter(self.seek(values, direction))
+            except (TypeError, ValueError, ValidationError):
+                raise ValueError("invalid cursor")
+
+        # 한 행 더 읽어서 그 방향으로 더 있는지 판단
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if direction == BEFORE:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        if not rows:
+            return rows, None, None
+
+        next_cursor = self.cursor_for(rows[-1], AFTER) if has_next else None
+        previous_cursor = self.cursor_for(rows[0], BEFORE) if has_previous else None
+        return rows, next_cursor, previous_cursor
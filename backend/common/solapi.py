@@ -28,30 +28,130 @@ def generate_solapi_headers():
         "Content-Type": "application/json"
     }
 
-def send_sms(phone_number: str, message: str):
-    sender = settings.SOLAPI_SENDER_NUMBER
-
-    payload = {
-        "messages": [
-            {
-                "to": phone_number,
-                "from": sender,
-                "text": message
-            }
-        ]
-    }
 
-    headers = generate_solapi_headers()
+class SolapiError(Exception):
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SendResult:
+    def __init__(self, message_id=None, error=None, retryable=False):
+        self.message_id = message_id
+        self.error = error
+        self.retryable = retryable
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class SolapiClient:
+    """
+    keep-alive 세션 하나를 계속 재사용하는 Solapi 클라이언트.
+    문자 워커처럼 오래 사는 프로세스에서 하나만 만들어 쓴다.
+    """
+
+    def __init__(self, base_url=None, timeout=10):
+        self.base_url = (base_url or settings.SOLAPI_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.session = Session()
+
+    def send(self, phone_number: str, message: str):
+        """
+        문자 1건을 보내고 Solapi messageId 를 돌려준다. (없으면 None)
+        """
+        result = self.send_many([("0", phone_number, message)])["0"]
+        if not result.ok:
+            raise SolapiError(f"SMS 전송 실패: {result.error}")
+        return result.message_id
+
+    def send_many(self, messages):
+        """
+        [(key, 수신번호, 본문), ...] 을 서명 1회, 요청 1회로 보낸다.
+        각 메시지의 customFields 에 key 를 실어 보내고, 응답을 key 별 SendResult 로 돌려준다.
+        응답에 customFields 가 없으면 수신번호로 맞추고, 끝내 결과를 찾지 못한 메시지는
+        재시도 가능한 실패로 돌려준다. 요청 자체가 실패하면 SolapiError 를 올린다.
+        """
+        sender = settings.SOLAPI_SENDER_NUMBER
+
+        payload = {
+            "messages": [
+                {
+                    "to": phone_number,
+                    "from": sender,
+                    "text": text,
+                    "customFields": {"key": str(key)},
+                }
+                for key, phone_number, text in messages
+            ]
+        }
+
+        req = Request(
+            "POST",
+            f"{self.base_url}/messages/v4/send-many/detail",
+            headers=generate_solapi_headers(),
+            json=payload
+        ).prepare()
+
+        response = self.session.send(req, timeout=self.timeout)
+
+        if not response.ok:
+            raise SolapiError(
+                f"SMS 전송 실패: {response.status_code} - {response.text}",
+                retryable=response.status_code >= 500,
+            )
 
-    req = Request(
-        "POST",
-        "https://api.solapi.com/messages/v4/send-many",
-        headers=headers,
-        json=payload
-    ).prepare()
+        body = response.json() if response.content else {}
 
-    session = Session()
-    response = session.send(req)
+        pending = {str(key): _digits(phone_number) for key, phone_number, _ in messages}
+        results = {}
 
-    if not response.ok:
-        raise Exception(f"SMS 전송 실패: {response.status_code} - {response.text}")
\ No newline at end of file
+        def match(item):
+            key = (item.get("customFields") or {}).get("key")
+            if key not in pending:
+                to = _digits(item.get("to"))
+                key = next((k for k, number in pending.items() if number == to), None)
+            if key is not None:
+                del pending[key]
+            return key
+
+        for item in body.get("messageList") or []:
+            key = match(item)
+            if key is not None:
+                results[key] = SendResult(message_id=item.get("messageId"))
+
+        for item in body.get("failedMessageList") or []:
+            key = match(item)
+            if key is not None:
+                results[key] = SendResult(
+                    message_id=item.get("messageId"),
+                    error=item.get("statusMessage") or item.get("statusCode") or "발송 실패",
+                )
+
+        # 결과를 확인할 수 없는 메시지는 접수됐다고 가정하지 않는다
+        for key in pending:
+            results[key] = SendResult(error="응답에서 발송 결과를 찾을 수 없습니다.", retryable=True)
+
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+def _digits(phone_number):
+    return "".join(ch for ch in str(phone_number or "") if ch.isdigit())
+
+
+_client = None
+
+
+def get_client() -> SolapiClient:
+    global _client
+    if _client is None:
+        _client = SolapiClient()
+    return _client
+
+
+def send_sms(phone_number: str, message: str):
+    return get_client().send(phone_number, message)
@@ -0,0 +1,113 @@
+"""
+테스트/로컬 개발용 Solapi 대역 서버.
+
+/messages/v4/send-many(/detail) 요청만 흉내 내며, 받은 메시지를 메모리에 기록한다.
+단독 실행: python -m common.solapi_stub 8025
+"""
+import json
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SolapiStubServer:
+    def __init__(self, host="127.0.0.1", port=0, fail_numbers=(), status_code=200,
+                 echo_custom_fields=True, drop_numbers=()):
+        self.fail_numbers = set(fail_numbers)
+        self.status_code = status_code
+        self.echo_custom_fields = echo_custom_fields  # False 면 응답에 customFields 를 싣지 않는다
+        self.drop_numbers = set(drop_numbers)  # 응답 목록에서 빠지는 수신번호
+        self.requests = []
+        self.lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def messages(self):
+        with self.lock:
+            return [m for body in self.requests for m in body.get("messages", [])]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path not in ("/messages/v4/send-many", "/messages/v4/send-many/detail"):
+                    return self._reply(404, {"errorCode": "NotFound"})
+                if not (self.headers.get("Authorization") or "").startswith("HMAC-SHA256 apiKey="):
+                    return self._reply(401, {"errorCode": "Unauthorized"})
+                if stub.status_code != 200:
+                    return self._reply(stub.status_code, {"errorCode": "StubError"})
+
+                with stub.lock:
+                    stub.requests.append(body)
+
+                message_list, failed_list = [], []
+                for message in body.get("messages", []):
+                    if message.get("to") in stub.drop_numbers:
+                        continue
+                    result = {
+                        "messageId": f"M{uuid.uuid4().hex[:20].upper()}",
+                        "to": message.get("to"),
+                    }
+                    if stub.echo_custom_fields:
+                        result["customFields"] = message.get("customFields", {})
+                    if message.get("to") in stub.fail_numbers:
+                        result.update(statusCode="1062", statusMessage="유효하지 않은 수신번호")
+                        failed_list.append(result)
+                    else:
+                        result.update(statusCode="2000", statusMessage="정상 접수")
+                        message_list.append(result)
+
+                self._reply(200, {
+                    "groupInfo": {"groupId": f"G{uuid.uuid4().hex[:20].upper()}"},
+                    "messageList": message_list,
+                    "failedMessageList": failed_list,
+                })
+
+            def _reply(self, code, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8025
+    server = SolapiStubServer(port=port)
+    print(f"Solapi stub listening on {server.url}")
+    server.httpd.serve_forever()
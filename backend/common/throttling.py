@@ -0,0 +1,141 @@
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.throttling import BaseThrottle
+
+
+def _incr(key, timeout):
+    """
+    원자적 증가. 키가 없으면 먼저 만든다. (memcached/redis/locmem 모두 incr 은 원자적)
+    """
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # add 와 incr 사이에 만료된 경우
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def _decr(key):
+    try:
+        cache.decr(key)
+    except ValueError:
+        # 이미 만료된 경우
+        pass
+
+
+def is_process_local_cache():
+    """
+    기본 캐시가 프로세스마다 따로인지 여부. 이때 카운터는 웹 프로세스 안에서만 보인다.
+    """
+    return isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def throttle_rates():
+    return settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})
+
+
+def stats_key(scope, kind):
+    return f"throttle:stats:{scope}:{kind}"
+
+
+def get_throttle_stats(scopes):
+    """
+    scope 별 허용(hit)/거절(deny) 누적 횟수
+    """
+    return {
+        scope: {
+            "hit": cache.get(stats_key(scope, "hit"), 0),
+            "deny": cache.get(stats_key(scope, "deny"), 0),
+        }
+        for scope in scopes
+    }
+
+
+def reset_throttle_stats(scopes):
+    cache.delete_many([stats_key(scope, kind) for scope in scopes for kind in ("hit", "deny")])
+
+
+class SlidingWindowThrottle(ABC, BaseThrottle):
+    """
+    캐시 카운터 기반 슬라이딩 윈도 제한.
+
+    고정 구간 카운터 두 개(현재/직전)를 현재 구간 경과 비율로 가중합해
+    최근 period 동안의 요청 수를 근사한다. 요청당 캐시 연산만 하고 DB는 쓰지 않는다.
+    뷰의 throttle_scope 로 DEFAULT_THROTTLE_RATES 에서 제한값을 찾는다.
+    거절된 요청은 구간 카운터에 남기지 않으므로, 계속 재시도해도 제한이 연장되지 않는다.
+    """
+    scope_suffix = ""
+
+    @abstractmethod
+    def get_ident_key(self, request):
+        """
+        제한 대상 식별값. None 이면 제한하지 않는다.
+        """
+
+    def get_scope(self, view):
+        scope = getattr(view, "throttle_scope", None)
+        return f"{scope}{self.scope_suffix}" if scope else None
+
+    def parse_rate(self, rate):
+        num, period = rate.split("/")
+        duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), duration
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = throttle_rates().get(scope) if scope else None
+        ident = self.get_ident_key(request)
+        if rate is None or not ident:
+            return True
+
+        num_requests, duration = self.parse_rate(rate)
+
+        now = time.time()
+        window = int(now // duration)
+        elapsed = (now % duration) / duration
+
+        key = f"throttle:{scope}:{ident}"
+        current_key = f"{key}:{window}"
+        current = _incr(current_key, duration * 2)
+        previous = cache.get(f"{key}:{window - 1}", 0)
+
+        estimated = previous * (1 - elapsed) + current
+        if estimated > num_requests:
+            _decr(current_key)
+            self.remaining = (1 - elapsed) * duration
+            _incr(stats_key(scope, "deny"), None)
+            return False
+
+        _incr(stats_key(scope, "hit"), None)
+        return True
+
+    def wait(self):
+        return getattr(self, "remaining", None)
+
+
+class PhoneNumberThrottle(SlidingWindowThrottle):
+    """
+    요청 본문의 phone_number 기준 제한
+    """
+
+    def get_ident_key(self, request):
+        phone_number = request.data.get("phone_number") if hasattr(request.data, "get") else None
+        if not phone_number:
+            return None
+        return "".join(ch for ch in str(phone_number) if ch.isdigit())
+
+
+class ClientIPThrottle(SlidingWindowThrottle):
+    """
+    클라이언트 IP 기준 제한 (scope 뒤에 _ip 를 붙인 제한값 사용)
+    """
+    scope_suffix = "_ip"
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
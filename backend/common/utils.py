@@ -1,4 +1,6 @@
+import hashlib
 import random
+import secrets
 import string
 import uuid
 from partnerships.models import Partnership
@@ -15,11 +17,47 @@ def generate_verification_code(length=6) -> str:
     return ''.join(random.choices('0123456789', k=length))
 
 
-def generate_short_code(length: int = 8) -> str:
+SHORT_CODE_ALPHABET = "23456789ABCDEFGHJKLMNPQRSTUVWXYZ"  # 헷갈리는 0/O/1/I 제외, 32자
+SHORT_CODE_LENGTH = 9          # 랜덤 8자리 + 검증 문자 1자리
+LEGACY_SHORT_CODE_LENGTH = 8   # 이전 형식 (영문 대문자+숫자 8자리, 검증 문자 없음)
+
+
+def _short_code_check_char(payload: str) -> str:
+    """
+    Luhn mod N 검증 문자. 한 글자 오타와 인접 문자 자리바꿈을 잡아낸다.
+    """
+    n = len(SHORT_CODE_ALPHABET)
+    total = 0
+    factor = 2
+    for ch in reversed(payload):
+        addend = factor * SHORT_CODE_ALPHABET.index(ch)
+        addend = addend // n + addend % n
+        total += addend
+        factor = 1 if factor == 2 else 2
+    return SHORT_CODE_ALPHABET[(n - total % n) % n]
+
+
+def generate_short_code() -> str:
+    """
+    9자리 쿠폰 식별 번호, secrets 로 뽑은 8자리(40비트) + 검증 문자 1자리
+    """
+    payload = "".join(secrets.choice(SHORT_CODE_ALPHABET) for _ in range(SHORT_CODE_LENGTH - 1))
+    return payload + _short_code_check_char(payload)
+
+
+def is_valid_short_code(code) -> bool:
     """
-    8자리 영문+숫자 문자열, 쿠폰 식별용 번호로 활용
+    DB 조회 없이 쿠폰 번호 형식/검증 문자를 확인한다.
     """
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+    if not isinstance(code, str):
+        return False
+
+    if len(code) == LEGACY_SHORT_CODE_LENGTH:
+        return code.isascii() and code.isalnum() and code.upper() == code
+
+    if len(code) != SHORT_CODE_LENGTH or any(ch not in SHORT_CODE_ALPHABET for ch in code):
+        return False
+    return _short_code_check_char(code[:-1]) == code[-1]
 
 
 def generate_slug(length: int = 10) -> str:
@@ -35,6 +73,15 @@ def generate_slug(length: int = 10) -> str:
 
 
 
+def hash_token(token: str) -> str:
+    """
+    리프레시 토큰의 SHA-256 다이제스트(64자), DB 저장 및 조회 키로 활용
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+
+
 def generate_temp_password(length=8):
     """
     8자리 랜덤 문자열, 비밀번호 재설정
@@ -1,6 +1,9 @@
+from django.conf import settings
+from django.db.models import Q
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from accounts.models import OwnerUser, ConsumerUser
+from accounts.cache import USER_MODELS, get_cached_user, get_claims_version
 
 class CustomJWTAuthentication(JWTAuthentication):
     def get_user(self, validated_token):
@@ -10,12 +13,130 @@ class CustomJWTAuthentication(JWTAuthentication):
         if user_id is None or role is None:
             raise AuthenticationFailed("토큰에 사용자 식별자가 포함되어 있지 않습니다.")
 
+        if role not in USER_MODELS:
+            raise AuthenticationFailed("유효하지 않은 사용자 유형입니다.")
+
+        # 클레임 토큰은 가게/제휴가 바뀐 뒤에는 거절한다 (401 → 클라이언트가 재발급)
+        # 캐시 사본이 다른 워커의 옛 값일 수 있으므로, 다르면 DB 원본으로 한 번 더 확인한다.
+        if "claims_version" in validated_token:
+            store_id = validated_token.get("store_id")
+            version = validated_token["claims_version"]
+            if (
+                get_claims_version(store_id) != version
+                and get_claims_version(store_id, refresh=True) != version
+            ):
+                raise AuthenticationFailed("토큰 정보가 최신이 아닙니다. 다시 발급받아주세요.")
+
+        # 매 요청마다 DB를 조회하지 않도록 캐시를 거친다 (accounts.signals 에서 무효화)
         try:
-            if role == "owner":
-                return OwnerUser.objects.get(id=user_id)
-            elif role == "consumer":
-                return ConsumerUser.objects.get(id=user_id)
+            return get_cached_user(role, user_id)
         except (OwnerUser.DoesNotExist, ConsumerUser.DoesNotExist):
             raise AuthenticationFailed("해당 사용자가 존재하지 않습니다.")
 
-        raise AuthenticationFailed("유효하지 않은 사용자 유형입니다.")
+
+def active_partnerships(store_id):
+    from partnerships.models import Partnership
+
+    return Partnership.objects.filter(
+        Q(store_a_id=store_id) | Q(store_b_id=store_id),
+        status="active",
+    )
+
+
+def find_active_partnership_id(store_id):
+    return active_partnerships(store_id).values_list("id", flat=True).first()
+
+
+def add_owner_claims(access, user):
+    """
+    OWNER_TOKEN_CLAIMS 가 켜져 있으면 access 토큰에 가게/제휴 정보를 담는다.
+    """
+    from stores.models import Store
+
+    if not settings.OWNER_TOKEN_CLAIMS:
+        return access
+
+    store_id = Store.objects.filter(owner=user).values_list("id", flat=True).first()
+    if store_id is None:
+        return access
+
+    access["store_id"] = store_id
+    access["is_verified"] = user.is_verified
+    access["partnership_id"] = find_active_partnership_id(store_id)
+    access["claims_version"] = get_claims_version(store_id, refresh=True)  # 발급은 항상 DB 원본 기준
+    return access
+
+
+_UNSET = object()
+
+
+class OwnerPrincipal:
+    """
+    사장님 요청 주체. 클레임 토큰이면 DB 없이 구성되고,
+    클레임이 없는 토큰이면 가게를 한 번 조회해 store 로 함께 들고 다닌다.
+    """
+
+    def __init__(self, user, store_id, is_verified, partnership_id=_UNSET, store=_UNSET):
+        self.user = user
+        self.store_id = store_id
+        self.is_verified = is_verified
+        self._partnership_id = partnership_id
+        self._store = store
+
+    @property
+    def store(self):
+        from stores.models import Store
+
+        if self._store is _UNSET:
+            self._store = (
+                Store.objects.filter(id=self.store_id).first() if self.store_id else None
+            )
+        return self._store
+
+    @property
+    def partnership_id(self):
+        if self._partnership_id is _UNSET:
+            self._partnership_id = (
+                find_active_partnership_id(self.store_id) if self.store_id else None
+            )
+        return self._partnership_id
+
+    def get_active_partnership(self):
+        """
+        활성 제휴를 한 번의 쿼리로 가져온다. 클레임에 제휴 id 가 있으면 그것으로 찾는다.
+        """
+        from partnerships.models import Partnership
+
+        if self.store_id is None:
+            return None
+        if self._partnership_id is _UNSET:
+            return active_partnerships(self.store_id).first()
+        if self._partnership_id is None:
+            return None
+        return Partnership.objects.filter(id=self._partnership_id, status="active").first()
+
+
+def get_owner_principal(request):
+    from stores.models import Store
+
+    user = request.user
+    token = request.auth
+
+    if token is not None and "claims_version" in token:
+        return OwnerPrincipal(
+            user=user,
+            store_id=token.get("store_id"),
+            is_verified=token.get("is_verified", False),
+            partnership_id=token.get("partnership_id"),
+        )
+
+    if not isinstance(user, OwnerUser):
+        return OwnerPrincipal(user=user, store_id=None, is_verified=False, partnership_id=None)
+
+    store = Store.objects.filter(owner=user).first()
+    return OwnerPrincipal(
+        user=user,
+        store_id=store.id if store else None,
+        is_verified=user.is_verified,
+        store=store,
+    )
@@ -102,14 +102,49 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "common.exceptions.custom_exception_handler",
     "DEFAULT_THROTTLE_CLASSES": [],
     "DEFAULT_THROTTLE_RATES": {
+        # common.throttling: 휴대폰 번호 기준 / 같은 scope + "_ip" 는 IP 기준
         "daily_phone": "10/day",
+        "daily_phone_ip": "50/day",
+        "verify_phone": "10/hour",
+        "verify_phone_ip": "60/hour",
+        "consumer_login": "10/hour",
+        "consumer_login_ip": "60/hour",
     },
+    # 앞단 프록시(nginx) 개수. X-Forwarded-For 의 오른쪽에서 이 개수만큼의 주소를 클라이언트 IP 로 본다.
+    # (클라이언트가 직접 보낸 앞쪽 값은 무시된다)
+    "NUM_PROXIES": config("NUM_PROXIES", default=1, cast=int),
     
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
 }
 
+# CACHE (기본은 프로세스 로컬, CACHE_BACKEND 로 공유 캐시 지정 가능)
+CACHE_BACKEND = config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default="neighbiz"),
+    }
+}
+
+# 인증/요청 제한/발급 대상/통계 키가 모두 이 캐시를 쓰므로 자체 정리(cull)하는 백엔드는
+# 기본값(300개)보다 넉넉하게. memcached/redis 는 OPTIONS 를 클라이언트로 넘기므로 제외
+if CACHE_BACKEND.rsplit(".", 2)[-2] in ("locmem", "filebased", "db"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10000, cast=int),
+        "CULL_FREQUENCY": 4,
+    }
+
+# 인증 사용자 캐시 유지 시간 (초)
+AUTH_USER_CACHE_TIMEOUT = config("AUTH_USER_CACHE_TIMEOUT", default=300, cast=int)
+
+# 사장님 access 토큰에 store_id / 제휴 id 등을 담아 뷰에서 DB 조회를 생략 (opt-in)
+OWNER_TOKEN_CLAIMS = config("OWNER_TOKEN_CLAIMS", default=False, cast=bool)
+
+# 가게명 자동완성 색인(프로세스 메모리)을 DB 에서 다시 읽는 최대 간격 (초)
+STORE_AUTOCOMPLETE_REFRESH = config("STORE_AUTOCOMPLETE_REFRESH", default=300, cast=int)
+
 # STATIC/MEDIA
 STATIC_URL = "/backend-static/"
 STATIC_ROOT = "/app/staticfiles"
@@ -132,6 +167,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 SOLAPI_API_KEY = config("SOLAPI_API_KEY").strip()
 SOLAPI_API_SECRET = config("SOLAPI_API_SECRET").strip()
 SOLAPI_SENDER_NUMBER = config("SOLAPI_SENDER_NUMBER").strip()
+SOLAPI_BASE_URL = config("SOLAPI_BASE_URL", default="https://api.solapi.com")
 
 # AWS S3
 AWS_ACCESS_KEY_ID = config("AWS_ACCESS_KEY_ID")
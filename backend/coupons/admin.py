@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import CouponPolicy, Coupon
+from common.enums import CouponStatus
+from .models import CouponPolicy, Coupon, CouponMonthlyCounter, CouponDailyStat
 
 @admin.register(CouponPolicy)
 class CouponPolicyAdmin(admin.ModelAdmin):
@@ -20,7 +21,7 @@ class CouponAdmin(admin.ModelAdmin):
         "user",
         "partnership_name",
         "policy_store_name",
-        "status",
+        "effective_status",
         "issued_at",
         "used_at",
         "expired_at",
@@ -40,6 +41,13 @@ class CouponAdmin(admin.ModelAdmin):
     )
     ordering = ("-issued_at",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_effective_status()
+
+    def effective_status(self, obj):
+        return dict(CouponStatus.choices()).get(obj.effective_status, obj.effective_status)
+    effective_status.short_description = "상태"
+
     def partnership_name(self, obj):
         from partnerships.models import Partnership
 
@@ -58,3 +66,19 @@ class CouponAdmin(admin.ModelAdmin):
     def policy_store_name(self, obj):
         return obj.policy.store.name
     policy_store_name.short_description = "정책 가맹점"
+
+
+@admin.register(CouponMonthlyCounter)
+class CouponMonthlyCounterAdmin(admin.ModelAdmin):
+    list_display = ("id", "policy", "month", "issued")
+    list_filter = ("month",)
+    search_fields = ("policy__store__name",)
+    ordering = ("-month",)
+
+
+@admin.register(CouponDailyStat)
+class CouponDailyStatAdmin(admin.ModelAdmin):
+    list_display = ("id", "partnership_slug", "date", "issued", "used")
+    list_filter = ("date",)
+    search_fields = ("partnership_slug",)
+    ordering = ("-date",)
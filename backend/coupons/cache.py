@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.db.models import Case, F, OuterRef, Q, Subquery, When
+from partnerships.models import Partnership
+from .models import CouponPolicy
+
+
+ISSUE_TARGET_TIMEOUT = 60 * 10
+
+
+def issue_target_key(slug: str) -> str:
+    return f"coupons:issue-target:{slug}"
+
+
+def resolve_issue_target(slug: str):
+    """
+    QR slug → {"id": 제휴 id, "target_store_id": 쿠폰을 주는 가게,
+               "policy_id": 활성 정책 id, "monthly_limit": 정책의 월간 한도}
+    활성 제휴가 없으면 None. 캐시에 없으면 제휴/정책을 조인 쿼리 한 번으로 구한다.
+    (coupons.signals 에서 제휴/정책 변경 시 무효화)
+    """
+    key = issue_target_key(slug)
+    target = cache.get(key)
+
+    if target is None:
+        active_policy = CouponPolicy.objects.filter(
+            store_id=OuterRef("target_store_id"),
+            is_active=True,
+        ).order_by("id")
+
+        target = Partnership.objects.filter(
+            Q(slug_for_a=slug) | Q(slug_for_b=slug),
+            status="active",
+        ).annotate(
+            # slug_for_a 로 들어오면 상대 가게(store_b)의 쿠폰을 발급
+            target_store_id=Case(
+                When(slug_for_a=slug, then=F("store_b_id")),
+                default=F("store_a_id"),
+            ),
+            policy_id=Subquery(active_policy.values("id")[:1]),
+            monthly_limit=Subquery(active_policy.values("monthly_limit")[:1]),
+        ).values("id", "target_store_id", "policy_id", "monthly_limit").first()
+
+        # 없는 slug 도 {} 로 저장해 반복 스캔을 막는다
+        target = target or {}
+        cache.set(key, target, ISSUE_TARGET_TIMEOUT)
+
+    return target or None
+
+
+def invalidate_issue_targets(*slugs):
+    cache.delete_many([issue_target_key(slug) for slug in slugs if slug])
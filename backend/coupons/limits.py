@@ -0,0 +1,29 @@
+from django.db.models import F
+from .models import CouponMonthlyCounter
+
+
+def reserve_monthly_slot(policy_id, monthly_limit, day) -> bool:
+    """
+    이번 달 발급 한도에서 한 장을 예약한다.
+    UPDATE ... SET issued = issued + 1 WHERE issued < limit 한 번으로 끝나며,
+    한도가 차 있으면 False. 여러 워커가 동시에 불러도 한도를 넘지 않는다.
+    """
+    if monthly_limit is None:
+        return True
+
+    month = day.replace(day=1)
+    counter = CouponMonthlyCounter.objects.filter(
+        policy_id=policy_id,
+        month=month,
+        issued__lt=monthly_limit,
+    )
+
+    if counter.update(issued=F("issued") + 1):
+        return True
+
+    # 이번 달 첫 발급이면 행이 아직 없다 → 만들고 한 번 더 시도
+    CouponMonthlyCounter.objects.bulk_create(
+        [CouponMonthlyCounter(policy_id=policy_id, month=month, issued=0)],
+        ignore_conflicts=True,
+    )
+    return bool(counter.update(issued=F("issued") + 1))
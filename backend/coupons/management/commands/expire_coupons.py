@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from common.enums import CouponStatus
+from coupons.models import Coupon
+
+
+class Command(BaseCommand):
+    help = "만료 시각이 지난 active 쿠폰을 배치 단위로 expired 로 바꿉니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 만료 처리할 행 수")
+        parser.add_argument("--sleep", type=float, default=0.1, help="배치 사이 대기 시간(초)")
+        parser.add_argument("--daemon", action="store_true", help="주기적으로 계속 실행")
+        parser.add_argument("--interval", type=int, default=300, help="daemon 모드 실행 간격(초)")
+
+    def handle(self, *args, **options):
+        while True:
+            self.sweep(options)
+            if not options["daemon"]:
+                return
+            time.sleep(options["interval"])
+
+    def sweep(self, options):
+        """
+        부분 인덱스(status='active', expired_at)에서 batch_size 개씩 잘라 갱신한다.
+        갱신된 행은 인덱스 조건에서 빠지므로 매번 앞에서부터 다시 읽으면 된다.
+        """
+        now = timezone.now()
+        batch_size = options["batch_size"]
+        started = time.monotonic()
+        total = 0
+
+        while True:
+            ids = list(
+                Coupon.objects.expirable(now)
+                .order_by("expired_at")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            # 그 사이 사용된 쿠폰은 건드리지 않도록 상태 조건을 다시 건다
+            total += Coupon.objects.expirable(now).filter(pk__in=ids).update(status=CouponStatus.EXPIRED.value)
+
+            if len(ids) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed > 0 else 0
+        self.stdout.write(f"Coupon: {total}건 만료 처리 ({elapsed:.1f}s, {rate:.0f} rows/s)")
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncMonth
+
+from coupons.models import Coupon, CouponMonthlyCounter
+
+
+class Command(BaseCommand):
+    help = "발급된 쿠폰 기준으로 정책별 월간 발급 카운터를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", help="해당 월만 재계산 (YYYY-MM). 생략하면 전체")
+
+    def handle(self, *args, **options):
+        coupons = Coupon.objects.all()
+        counters = CouponMonthlyCounter.objects.all()
+
+        if options["month"]:
+            try:
+                month = datetime.strptime(options["month"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--month 는 YYYY-MM 형식이어야 합니다.")
+            coupons = coupons.filter(issued_at__year=month.year, issued_at__month=month.month)
+            counters = counters.filter(month=month)
+
+        # 월 경계는 TIME_ZONE(Asia/Seoul) 기준
+        rows = (
+            coupons.annotate(month=TruncMonth("issued_at", output_field=DateField()))
+            .values("policy_id", "month")
+            .annotate(issued=Count("id"))
+        )
+        rebuilt = [
+            CouponMonthlyCounter(policy_id=row["policy_id"], month=row["month"], issued=row["issued"])
+            for row in rows
+        ]
+
+        with transaction.atomic():
+            # 쿠폰이 하나도 없는 달은 0으로 남도록 먼저 비우고 덮어쓴다
+            counters.update(issued=0)
+            CouponMonthlyCounter.objects.bulk_create(
+                rebuilt,
+                update_conflicts=True,
+                unique_fields=["policy", "month"],
+                update_fields=["issued"],
+            )
+
+        self.stdout.write(f"카운터 {len(rebuilt)}개 재계산 완료")
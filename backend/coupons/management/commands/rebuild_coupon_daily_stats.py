@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from common.enums import CouponStatus
+from coupons.models import Coupon, CouponDailyStat
+
+
+class Command(BaseCommand):
+    help = "쿠폰 발급/사용 내역으로 제휴 slug 별 일간 통계(CouponDailyStat)를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", help="해당 slug 만 재계산. 생략하면 전체")
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 넣을 행 수")
+
+    def handle(self, *args, **options):
+        coupons = Coupon.objects.all()
+        stats = CouponDailyStat.objects.all()
+        if options["slug"]:
+            coupons = coupons.filter(partnership_slug=options["slug"])
+            stats = stats.filter(partnership_slug=options["slug"])
+
+        # TruncDate 는 TIME_ZONE(Asia/Seoul) 기준으로 날짜를 자른다
+        counts = defaultdict(lambda: [0, 0])
+        issued_rows = (
+            coupons.annotate(day=TruncDate("issued_at"))
+            .values("partnership_slug", "day")
+            .annotate(count=Count("id"))
+        )
+        for row in issued_rows:
+            counts[(row["partnership_slug"], row["day"])][0] = row["count"]
+
+        used_rows = (
+            coupons.filter(status=CouponStatus.USED.value, used_at__isnull=False)
+            .annotate(day=TruncDate("used_at"))
+            .values("partnership_slug", "day")
+            .annotate(count=Count("id"))
+        )
+        for row in used_rows:
+            counts[(row["partnership_slug"], row["day"])][1] = row["count"]
+
+        # 새 행은 updated_at 이 바뀌므로 웹 프로세스의 통계 버전(ETag/캐시)도 함께 바뀐다
+        with transaction.atomic():
+            stats.delete()
+            CouponDailyStat.objects.bulk_create(
+                [
+                    CouponDailyStat(partnership_slug=slug, date=day, issued=issued, used=used)
+                    for (slug, day), (issued, used) in counts.items()
+                ],
+                batch_size=options["batch_size"],
+            )
+
+        self.stdout.write(f"일간 통계 {len(counts)}행 재계산 완료")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_sms_outbox'),
+        ('coupons', '0004_coupon_partnership_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['user', 'partnership_slug', 'issued_at'], name='coupon_user_slug_issued_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:19
+
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_issue_date(apps, schema_editor):
+    """
+    기존 쿠폰의 발급일을 채운다. 이미 같은 날 중복 발급된 쿠폰은
+    가장 먼저 발급된 것만 날짜를 갖고 나머지는 NULL로 남긴다.
+    """
+    Coupon = apps.get_model("coupons", "Coupon")
+    tz = ZoneInfo(settings.TIME_ZONE)
+    seen = set()
+
+    for coupon in Coupon.objects.only("id", "user_id", "partnership_slug", "issued_at").order_by("id").iterator():
+        issue_date = coupon.issued_at.astimezone(tz).date()
+        key = (coupon.user_id, coupon.partnership_slug, issue_date)
+        if key in seen:
+            continue
+        seen.add(key)
+        Coupon.objects.filter(id=coupon.id).update(issue_date=issue_date)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0005_coupon_user_slug_issued_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="coupon",
+            name="coupon_user_slug_issued_idx",
+        ),
+        migrations.AddField(
+            model_name="coupon",
+            name="issue_date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_issue_date, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="coupon",
+            constraint=models.UniqueConstraint(
+                fields=("user", "partnership_slug", "issue_date"),
+                name="unique_daily_coupon",
+            ),
+        ),
+    ]
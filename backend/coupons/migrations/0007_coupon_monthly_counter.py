@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def backfill_current_month(apps, schema_editor):
+    """
+    이번 달(TIME_ZONE 기준) 발급분으로 카운터를 채운다. 비워 두면 배포 직후
+    모든 정책의 이번 달 발급 수가 0부터 다시 시작해 한도를 한 번 더 쓸 수 있다.
+    지난 달 카운터는 한도 판단에 쓰이지 않으므로 rebuild_coupon_counters 로 채운다.
+    """
+    Coupon = apps.get_model("coupons", "Coupon")
+    CouponMonthlyCounter = apps.get_model("coupons", "CouponMonthlyCounter")
+
+    month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    rows = (
+        Coupon.objects.filter(issued_at__gte=month_start)
+        .values("policy_id")
+        .annotate(issued=Count("id"))
+    )
+    CouponMonthlyCounter.objects.bulk_create(
+        [
+            CouponMonthlyCounter(policy_id=row["policy_id"], month=month_start.date(), issued=row["issued"])
+            for row in rows
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0006_coupon_issue_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CouponMonthlyCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("issued", models.PositiveIntegerField(default=0)),
+                (
+                    "policy",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_counters",
+                        to="coupons.couponpolicy",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("policy", "month"), name="unique_policy_month_counter"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_current_month, migrations.RunPython.noop),
+    ]
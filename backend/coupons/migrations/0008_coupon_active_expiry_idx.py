@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0007_coupon_monthly_counter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="coupon",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["expired_at"],
+                name="coupon_active_expiry_idx",
+            ),
+        ),
+    ]
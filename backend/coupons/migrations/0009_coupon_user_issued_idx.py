@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_sms_outbox"),
+        ("coupons", "0008_coupon_active_expiry_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="coupon",
+            index=models.Index(
+                fields=["user", "issued_at", "id"], name="coupon_user_issued_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0009_coupon_user_issued_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="coupon",
+            index=models.Index(
+                fields=["partnership_slug", "issued_at"], name="coupon_slug_issued_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="coupon",
+            index=models.Index(
+                fields=["partnership_slug", "status", "used_at"],
+                name="coupon_slug_status_used_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:29
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    """
+    기존 쿠폰 발급/사용 내역으로 일간 통계를 채운다 (rebuild_coupon_daily_stats 와 같은 집계).
+    비워 두면 배포 직후 모든 제휴 통계가 0으로 보인다.
+    """
+    Coupon = apps.get_model("coupons", "Coupon")
+    CouponDailyStat = apps.get_model("coupons", "CouponDailyStat")
+
+    counts = defaultdict(lambda: [0, 0])
+    issued_rows = (
+        Coupon.objects.annotate(day=TruncDate("issued_at"))
+        .values("partnership_slug", "day")
+        .annotate(count=Count("id"))
+    )
+    for row in issued_rows:
+        counts[(row["partnership_slug"], row["day"])][0] = row["count"]
+
+    used_rows = (
+        Coupon.objects.filter(status="used", used_at__isnull=False)
+        .annotate(day=TruncDate("used_at"))
+        .values("partnership_slug", "day")
+        .annotate(count=Count("id"))
+    )
+    for row in used_rows:
+        counts[(row["partnership_slug"], row["day"])][1] = row["count"]
+
+    CouponDailyStat.objects.bulk_create(
+        [
+            CouponDailyStat(partnership_slug=slug, date=day, issued=issued, used=used)
+            for (slug, day), (issued, used) in counts.items()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0010_coupon_stats_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CouponDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("partnership_slug", models.CharField(max_length=32)),
+                ("date", models.DateField()),
+                ("issued", models.PositiveIntegerField(default=0)),
+                ("used", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("partnership_slug", "date"),
+                        name="unique_slug_daily_stat",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0011_coupon_daily_stat"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="couponpolicy",
+            index=models.Index(fields=["updated_at", "id"], name="policy_updated_idx"),
+        ),
+    ]
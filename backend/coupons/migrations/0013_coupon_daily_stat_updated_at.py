@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coupons", "0012_policy_updated_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="coupondailystat",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
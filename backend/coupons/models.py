@@ -27,7 +27,37 @@ class CouponPolicy(models.Model):
     def __str__(self):
         return f"{self.store.name} - {self.expected_value}원 혜택"
 
+    class Meta:
+        indexes = [
+            # 게시글 피드 커서 모드: 최신순 (updated_at, id) 키셋
+            models.Index(fields=["updated_at", "id"], name="policy_updated_idx"),
+        ]
+
+
+
+
+class CouponQuerySet(models.QuerySet):
+    def expirable(self, now=None):
+        """
+        만료 시각이 지났는데 아직 active 로 남은 쿠폰 (부분 인덱스 coupon_active_expiry_idx 사용)
+        """
+        return self.filter(status=CouponStatus.ACTIVE.value, expired_at__lt=now or timezone.now())
 
+    def with_effective_status(self, now=None):
+        """
+        스위퍼가 아직 돌지 않았어도 만료된 쿠폰은 expired 로 보이도록 SQL 에서 상태를 계산한다.
+        """
+        return self.annotate(
+            effective_status=models.Case(
+                models.When(
+                    status=CouponStatus.ACTIVE.value,
+                    expired_at__lt=now or timezone.now(),
+                    then=models.Value(CouponStatus.EXPIRED.value),
+                ),
+                default=models.F("status"),
+                output_field=models.CharField(),
+            )
+        )
 
 
 class Coupon(models.Model):
@@ -44,18 +74,20 @@ class Coupon(models.Model):
     )
 
     issued_at = models.DateTimeField(auto_now_add=True)
+    issue_date = models.DateField(null=True)  # 발급일(Asia/Seoul), 하루 1장 제한용 (기존 중복분은 NULL)
     used_at = models.DateTimeField(null=True, blank=True)
     expired_at = models.DateTimeField(null=True)
 
+    objects = CouponQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
+        if not self.issue_date:
+            self.issue_date = timezone.localdate(self.issued_at) if self.issued_at else timezone.localdate()
+
         if not self.expired_at and self.issued_at:
             self.expired_at = self.issued_at + timedelta(hours=24)
 
-        # 만료 체크
-        if self.expired_at and self.expired_at < timezone.now() and self.status == CouponStatus.ACTIVE.value:
-            self.status = CouponStatus.EXPIRED.value
-
+        # 만료 처리는 expire_coupons 명령이 일괄로 한다 (읽을 때는 with_effective_status)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -64,4 +96,60 @@ class Coupon(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["short_code"]),
+            # 소비자 쿠폰함: 최신순 키셋 페이지네이션 (user, issued_at, id)
+            models.Index(fields=["user", "issued_at", "id"], name="coupon_user_issued_idx"),
+            # 제휴 통계: slug 별 발급 기간 / 사용 기간 집계
+            models.Index(fields=["partnership_slug", "issued_at"], name="coupon_slug_issued_idx"),
+            models.Index(fields=["partnership_slug", "status", "used_at"], name="coupon_slug_status_used_idx"),
+            # 만료 스위퍼용: active 인 쿠폰만 담는 부분 인덱스
+            models.Index(
+                fields=["expired_at"],
+                condition=models.Q(status="active"),
+                name="coupon_active_expiry_idx",
+            ),
+        ]
+        constraints = [
+            # 같은 소비자는 같은 QR(slug)로 하루에 한 장만 발급
+            models.UniqueConstraint(
+                fields=["user", "partnership_slug", "issue_date"],
+                name="unique_daily_coupon",
+            ),
         ]
+
+
+class CouponMonthlyCounter(models.Model):
+    """
+    정책별 월간 발급 수. 발급 시 조건부 UPDATE 로 한도 안에서만 1씩 올린다.
+    """
+    policy = models.ForeignKey(CouponPolicy, on_delete=models.CASCADE, related_name="monthly_counters")
+    month = models.DateField()  # 해당 월 1일 (Asia/Seoul)
+    issued = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.policy_id} {self.month:%Y-%m}: {self.issued}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["policy", "month"], name="unique_policy_month_counter"),
+        ]
+
+
+class CouponDailyStat(models.Model):
+    """
+    제휴 slug 별 일간 발급/사용 수 롤업. 날짜는 Asia/Seoul 기준.
+    발급/사용 시점에 coupons.stats 에서 원자적으로 올리고, rebuild_coupon_daily_stats 로 다시 만들 수 있다.
+    """
+    partnership_slug = models.CharField(max_length=32)
+    date = models.DateField()
+    issued = models.PositiveIntegerField(default=0)
+    used = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)  # 통계 버전(coupons.stats.get_stats_version) 계산용
+
+    def __str__(self):
+        return f"{self.partnership_slug} {self.date}: {self.issued}/{self.used}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["partnership_slug", "date"], name="unique_slug_daily_stat"),
+        ]
+
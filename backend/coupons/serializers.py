@@ -76,6 +76,12 @@ class CouponSerializer(serializers.ModelSerializer):
 
 
 class CouponSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+
+    def get_status(self, obj):
+        # with_effective_status 로 조회했으면 만료 반영된 상태를 쓴다
+        return getattr(obj, "effective_status", obj.status)
+
     class Meta:
         model = Coupon
         fields = [
@@ -86,4 +92,56 @@ class CouponSerializer(serializers.ModelSerializer):
             "used_at",
             "expired_at",
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+class CouponRedemptionSerializer(serializers.Serializer):
+    short_code = serializers.CharField(max_length=12)
+    used_at = serializers.DateTimeField()
+
+
+class CouponBatchUseSerializer(serializers.Serializer):
+    """
+    POS 오프라인 사용 내역 일괄 전송: [{"short_code", "used_at"(단말 기준 사용 시각)}, ...]
+    """
+    redemptions = CouponRedemptionSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=500,
+        error_messages={"max_length": "한 번에 최대 500개까지 보낼 수 있습니다."},
+    )
+
+
+class CouponBatchResultSerializer(serializers.Serializer):
+    """
+    result: used(반영됨/이미 같은 내역으로 반영됨) | already_used | expired | invalid_time | not_found
+    """
+    short_code = serializers.CharField()
+    result = serializers.CharField()
+    used_at = serializers.DateTimeField()
+
+
+class CouponWalletSerializer(serializers.ModelSerializer):
+    """
+    쿠폰함 목록: 쿠폰 + 정책/가게 정보 (select_related("policy__store") 로 한 번에 조회)
+    """
+    status = serializers.CharField(source="effective_status")
+    description = serializers.CharField(source="policy.description")
+    expected_value = serializers.IntegerField(source="policy.expected_value")
+    store_id = serializers.IntegerField(source="policy.store_id")
+    store_name = serializers.CharField(source="policy.store.name")
+
+    class Meta:
+        model = Coupon
+        fields = [
+            "id",
+            "short_code",
+            "status",
+            "issued_at",
+            "used_at",
+            "expired_at",
+            "description",
+            "expected_value",
+            "store_id",
+            "store_name",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,22 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from partnerships.models import Partnership
+from .models import CouponPolicy
+from .cache import invalidate_issue_targets
+
+
+# 제휴 또는 쿠폰 정책이 바뀌면 slug → 발급 대상 캐시를 비운다.
+
+@receiver([post_save, post_delete], sender=Partnership)
+def invalidate_partnership_targets(sender, instance, **kwargs):
+    invalidate_issue_targets(instance.slug_for_a, instance.slug_for_b)
+
+
+@receiver([post_save, post_delete], sender=CouponPolicy)
+def invalidate_policy_targets(sender, instance, **kwargs):
+    slugs = Partnership.objects.filter(
+        Q(store_a_id=instance.store_id) | Q(store_b_id=instance.store_id)
+    ).values_list("slug_for_a", "slug_for_b")
+
+    invalidate_issue_targets(*[slug for pair in slugs for slug in pair])
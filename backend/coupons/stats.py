@@ -0,0 +1,103 @@
+import hashlib
+
+from django.db import connection
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from common.enums import CouponStatus
+
+from .models import Coupon, CouponDailyStat
+
+
+# 일간 롤업(CouponDailyStat) 증가는 모두 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 처리한다.
+# 행이 없으면 만들고 있으면 더하므로 동시에 여러 요청이 와도 값이 빠지지 않는다. (PostgreSQL / SQLite 공통 문법)
+# 날짜는 TIME_ZONE(Asia/Seoul) 기준 timezone.localdate 로 나눈다.
+
+STAT_TABLE = CouponDailyStat._meta.db_table
+COUPON_TABLE = Coupon._meta.db_table
+
+UPSERT_ADD = (
+    'INSERT INTO "{stat}" ("partnership_slug", "date", "issued", "used", "updated_at") {source} '
+    'ON CONFLICT ("partnership_slug", "date") DO UPDATE '
+    'SET "issued" = "{stat}"."issued" + excluded."issued", "used" = "{stat}"."used" + excluded."used", '
+    '"updated_at" = excluded."updated_at"'
+)
+
+
+STATS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_stats_version(slug) -> str:
+    """
+    slug 롤업의 현재 상태 서명 (행 수, 발급/사용 합계, 마지막 변경 시각).
+    DB 에서 바로 읽으므로 다른 프로세스(다른 워커, rebuild_coupon_daily_stats)가 바꾼 내용도
+    다음 요청에서 보인다. 발급/사용은 합계를, 재계산은 updated_at 을 바꾼다.
+    """
+    state = CouponDailyStat.objects.filter(partnership_slug=slug).aggregate(
+        rows=Count("id"),
+        issued=Sum("issued"),
+        used=Sum("used"),
+        updated_at=Max("updated_at"),
+    )
+    signature = "|".join(str(state[name]) for name in ("rows", "issued", "used", "updated_at"))
+    return hashlib.sha1(signature.encode()).hexdigest()[:12]
+
+
+def stats_cache_key(slug, days, version) -> str:
+    # 날짜가 바뀌면 일별 구간도 바뀌므로 오늘 날짜도 키에 넣는다
+    return f"coupons:stats:{slug}:{days}:{timezone.localdate()}:{version}"
+
+
+def add_daily_stats(counts):
+    """
+    counts: {(slug, date): (issued, used)} 를 한 문장으로 더한다.
+    행 잠금 순서가 요청마다 같도록 키 순서로 정렬한다 (겹치는 배치가 동시에 와도 교착 상태가 나지 않게).
+    """
+    if not counts:
+        return
+
+    now = timezone.now()
+    rows = [(slug, day, issued, used, now) for (slug, day), (issued, used) in sorted(counts.items())]
+    source = "VALUES " + ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT_ADD.format(stat=STAT_TABLE, source=source),
+            [value for row in rows for value in row],
+        )
+
+
+def record_issued(slug, issued_at=None):
+    add_daily_stats({(slug, timezone.localdate(issued_at)): (1, 0)})
+
+
+# 단건 사용: 활성 + 미만료일 때만 바꾸고, 바뀐 행을 RETURNING 으로 받아 응답과 롤업에 쓴다 (별도 조회 없음)
+USE_COUPON = (
+    'UPDATE "{coupon}" SET "status" = %s, "used_at" = %s '
+    'WHERE "short_code" = %s AND "user_id" = %s AND "status" = %s '
+    'AND ("expired_at" > %s OR "expired_at" IS NULL) '
+    'RETURNING "id", "short_code", "partnership_slug", "status", "issued_at", "used_at", "expired_at"'
+)
+
+
+def use_coupon(short_code, user_id, used_at):
+    """
+    쿠폰을 사용 처리하고 사용 롤업을 더한다. 사용할 수 없는 쿠폰이면 None.
+    호출하는 쪽에서 transaction.atomic() 으로 감싼다.
+    """
+    adapted = connection.ops.adapt_datetimefield_value(used_at)
+    coupon = next(iter(Coupon.objects.raw(
+        USE_COUPON.format(coupon=COUPON_TABLE),
+        [
+            CouponStatus.USED.value,
+            adapted,
+            short_code,
+            user_id,
+            CouponStatus.ACTIVE.value,
+            adapted,
+        ],
+    )), None)
+
+    if coupon is not None:
+        add_daily_stats({(coupon.partnership_slug, timezone.localdate(used_at)): (0, 1)})
+    return coupon
@@ -1,3 +1,348 @@
+import re
+from datetime import date, timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import OwnerUser, ConsumerUser
+from common.pagination import encode_cursor
+from coupons.cache import resolve_issue_target
+from coupons.models import Coupon, CouponPolicy, CouponMonthlyCounter, CouponDailyStat
+from coupons.serializers import CouponSerializer
+from coupons.stats import add_daily_stats
+from partnerships.models import Partnership
+from stores.models import Store
+
+
+class capture_statements(CaptureQueriesContext):
+    """
+    실행된 SQL 문을 트랜잭션 제어문(SAVEPOINT/RELEASE 등)까지 모두 센다.
+    kinds 는 문장별 첫 단어 목록이라 왕복 구성을 그대로 확인할 수 있다.
+    """
+
+    def __init__(self):
+        super().__init__(connection)
+
+    @property
+    def kinds(self):
+        return [q["sql"].split(None, 1)[0].upper() for q in self.captured_queries]
+
+
+def make_store(username, name):
+    owner = OwnerUser.objects.create_user(username, "password", name=name, phone_number="01012345678")
+    return Store.objects.create(owner=owner, name=name, phone="0212345678", address="서울시 성동구")
+
+
+class CouponIssueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.store_a = make_store("storea", "카페A")
+        self.store_b = make_store("storeb", "빵집B")
+        self.policy_b = CouponPolicy.objects.create(
+            store=self.store_b, description="빵 1개 증정", expected_value=3000, monthly_limit=100
+        )
+        self.partnership = Partnership.objects.create(
+            store_a=self.store_a,
+            store_b=self.store_b,
+            start_date=date.today(),
+            slug_for_a="slugfora01",
+            slug_for_b="slugforb01",
+        )
+
+        self.consumer = ConsumerUser.objects.create(kakao_id="phone_01011112222", phone_number="01011112222")
+        self.client = APIClient()
+        self.client.force_authenticate(self.consumer)
+
+    def issue(self, slug="slugfora01"):
+        return self.client.post("/api/v1/coupons/issue/", {"slug": slug}, format="json")
+
+    def test_issue_uses_partner_store_policy(self):
+        response = self.issue()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Coupon.objects.get().policy, self.policy_b)
+
+    def test_ended_partnership_is_not_served_from_cache(self):
+        self.issue()
+        self.partnership.status = "ended"
+        self.partnership.save()
+
+        self.assertEqual(self.issue().status_code, 404)
+
+    def test_issue_round_trips(self):
+        resolve_issue_target("slugfora01")  # slug → 발급 대상 캐시 채우기
+        CouponMonthlyCounter.objects.create(policy=self.policy_b, month=timezone.localdate().replace(day=1))
+
+        # 발급 예산: 읽기 없이 트랜잭션 하나에 쓰기 세 번
+        # (쿠폰 INSERT + 월간 카운터 조건부 UPDATE + 일간 통계 upsert).
+        # 운영에서는 SAVEPOINT/RELEASE 대신 BEGIN/COMMIT 이 나가 왕복은 5회다.
+        # 카운터와 통계는 키가 달라 SQLite/Postgres 공통 SQL 로 한 문장에 합칠 수 없고,
+        # 한도 초과나 중복이면 함께 롤백되어야 하므로 같은 트랜잭션에 둔다.
+        with capture_statements() as statements:
+            response = self.issue()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(statements.kinds, ["SAVEPOINT", "INSERT", "UPDATE", "INSERT", "RELEASE"])
+
+        # 중복 발급: INSERT 가 제약에 걸려 롤백된 뒤 기존 쿠폰 조회
+        with capture_statements() as statements:
+            response = self.issue()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(statements.kinds, ["SAVEPOINT", "INSERT", "ROLLBACK", "RELEASE", "SELECT"])
+        self.assertEqual(Coupon.objects.filter(partnership_slug="slugfora01").count(), 1)
+
+    def test_monthly_limit_is_enforced(self):
+        self.policy_b.monthly_limit = 1
+        self.policy_b.save()
+        self.assertEqual(self.issue().status_code, 201)
+
+        other = ConsumerUser.objects.create(kakao_id="phone_01033334444", phone_number="01033334444")
+        self.client.force_authenticate(other)
+        response = self.issue()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error_code"], "MONTHLY_LIMIT_REACHED")
+        self.assertEqual(Coupon.objects.count(), 1)
+        self.assertEqual(CouponMonthlyCounter.objects.get().issued, 1)
+
+        # 한도가 찼어도 오늘 이미 받은 쿠폰은 그대로 돌려준다
+        self.client.force_authenticate(self.consumer)
+        self.assertEqual(self.issue().status_code, 200)
+
+    def test_rebuild_coupon_counters(self):
+        self.issue()
+        self.issue("slugforb01")  # 정책 없는 가게 → 발급 안 됨
+        CouponMonthlyCounter.objects.update(issued=7)
+
+        call_command("rebuild_coupon_counters", stdout=StringIO())
+
+        counter = CouponMonthlyCounter.objects.get()
+        self.assertEqual(counter.month, timezone.localdate().replace(day=1))
+        self.assertEqual(counter.issued, 1)
+
+    def test_counter_migration_backfills_current_month(self):
+        self.issue()
+        last_month = Coupon.objects.create(
+            user=self.consumer,
+            policy=self.policy_b,
+            short_code="OLDMONTH1",
+            partnership_slug="slugfora01",
+            issue_date=timezone.localdate() - timedelta(days=40),
+        )
+        Coupon.objects.filter(pk=last_month.pk).update(issued_at=timezone.now() - timedelta(days=40))
+        CouponMonthlyCounter.objects.all().delete()
+
+        migration = import_module("coupons.migrations.0007_coupon_monthly_counter")
+        migration.backfill_current_month(apps, None)
+
+        counter = CouponMonthlyCounter.objects.get()
+        self.assertEqual(counter.month, timezone.localdate().replace(day=1))
+        self.assertEqual(counter.issued, 1)
+
+    def test_use_is_single_conditional_update(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        use = lambda: self.client.post("/api/v1/coupons/use/", {"short_code": code}, format="json")
+
+        with capture_statements() as statements:
+            response = use()
+        self.assertEqual(response.status_code, 200)
+
+        # 응답은 발급/조회와 같은 CouponSerializer 모양 (RETURNING 값으로 채움)
+        coupon = Coupon.objects.get()
+        self.assertEqual(response.json()["data"]["coupon"], CouponSerializer(coupon).data)
+        self.assertEqual(response.json()["data"]["coupon"]["status"], "used")
+        # 조건부 UPDATE ... RETURNING + 일간 통계 upsert (한 트랜잭션)
+        self.assertEqual(statements.kinds, ["SAVEPOINT", "UPDATE", "INSERT", "RELEASE"])
+
+        # 두 번째 사용: UPDATE 가 아무 행도 못 바꾸고 사유 조회
+        response = use()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Coupon.objects.get().status, "used")
+
+    def test_use_rejects_expired_coupon(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        Coupon.objects.update(expired_at=timezone.now() - timedelta(minutes=1))
+
+        response = self.client.post("/api/v1/coupons/use/", {"short_code": code}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "쿠폰이 만료되었습니다.")
+        self.assertIsNone(Coupon.objects.get().used_at)
+
+    def test_expire_coupons_sweeps_only_overdue_active(self):
+        self.issue()
+        other = ConsumerUser.objects.create(kakao_id="phone_01033334444", phone_number="01033334444")
+        self.client.force_authenticate(other)
+        self.issue()
+
+        overdue = Coupon.objects.get(user=self.consumer)
+        Coupon.objects.filter(pk=overdue.pk).update(expired_at=timezone.now() - timedelta(minutes=1))
+
+        # 스위퍼 전에도 읽기 경로는 만료로 본다
+        self.assertEqual(Coupon.objects.with_effective_status().get(pk=overdue.pk).effective_status, "expired")
+
+        call_command("expire_coupons", "--batch-size", "1", "--sleep", "0", stdout=StringIO())
+
+        self.assertEqual(
+            dict(Coupon.objects.values_list("user_id", "status")),
+            {self.consumer.id: "expired", other.id: "active"},
+        )
+
+    def test_batch_use_is_idempotent(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        used_at = timezone.now().isoformat()
+        payload = {"redemptions": [
+            {"short_code": code, "used_at": used_at},
+            {"short_code": "ZZZZZZZZZ", "used_at": used_at},
+        ]}
+
+        owner_client = APIClient()
+        owner_client.force_authenticate(self.store_b.owner)
+
+        with capture_statements() as statements:
+            first = owner_client.post("/api/v1/coupons/use-batch/", payload, format="json")
+        self.assertEqual(first.status_code, 200)
+        results = {row["short_code"]: row["result"] for row in first.json()["data"]["results"]}
+        self.assertEqual(results, {code: "used", "ZZZZZZZZZ": "not_found"})
+        # 가게 조회 + (트랜잭션) 대상 잠금 조회 + UPDATE + 일간 통계 upsert
+        self.assertEqual(statements.kinds, ["SELECT", "SAVEPOINT", "SELECT", "UPDATE", "INSERT", "RELEASE"])
+
+        second = owner_client.post("/api/v1/coupons/use-batch/", payload, format="json")
+        self.assertEqual(second.json()["data"]["results"], first.json()["data"]["results"])
+        self.assertEqual(Coupon.objects.get().status, "used")
+
+    def test_batch_use_rejects_out_of_range_time(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        coupon = Coupon.objects.get()
+
+        owner_client = APIClient()
+        owner_client.force_authenticate(self.store_b.owner)
+        use_at = lambda used_at: owner_client.post(
+            "/api/v1/coupons/use-batch/",
+            {"redemptions": [{"short_code": code, "used_at": used_at.isoformat()}]},
+            format="json",
+        ).json()["data"]["results"][0]["result"]
+
+        self.assertEqual(use_at(coupon.issued_at - timedelta(hours=1)), "invalid_time")
+        self.assertEqual(use_at(timezone.now() + timedelta(hours=1)), "invalid_time")
+        self.assertEqual(Coupon.objects.get().status, "active")
+
+        # 시계 오차 범위 안은 허용
+        self.assertEqual(use_at(timezone.now() + timedelta(minutes=1)), "used")
+
+    def test_batch_use_only_for_own_store_coupons(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+
+        owner_client = APIClient()
+        owner_client.force_authenticate(self.store_a.owner)  # 쿠폰은 store_b 정책
+        response = owner_client.post(
+            "/api/v1/coupons/use-batch/",
+            {"redemptions": [{"short_code": code, "used_at": timezone.now().isoformat()}]},
+            format="json",
+        )
+
+        self.assertEqual(response.json()["data"]["results"][0]["result"], "not_found")
+        self.assertEqual(Coupon.objects.get().status, "active")
+
+    def test_wallet_keyset_pages(self):
+        now = timezone.now()
+        for day in range(5):
+            coupon = Coupon.objects.create(
+                user=self.consumer,
+                policy=self.policy_b,
+                short_code=f"WALLET{day:03d}",
+                partnership_slug="slugfora01",
+                issue_date=date(2026, 1, day + 1),
+                expired_at=now + timedelta(days=1),
+            )
+            Coupon.objects.filter(pk=coupon.pk).update(issued_at=now - timedelta(days=day))
+        Coupon.objects.filter(short_code="WALLET004").update(expired_at=now - timedelta(days=3))
+
+        codes = []
+        cursor = ""
+        while True:
+            with capture_statements() as statements:
+                response = self.client.get("/api/v1/coupons/wallet/", {"page_size": 2, "cursor": cursor})
+            self.assertEqual(statements.kinds, ["SELECT"])  # COUNT(*) 없이 조회 한 번
+
+            data = response.json()["data"]
+            codes += [row["short_code"] for row in data["results"]]
+            if not data["next"]:
+                break
+            cursor = data["next"]
+
+        self.assertEqual(codes, [f"WALLET{day:03d}" for day in range(5)])
+
+        response = self.client.get("/api/v1/coupons/wallet/", {"status": "expired"})
+        results = response.json()["data"]["results"]
+        self.assertEqual([row["short_code"] for row in results], ["WALLET004"])
+        self.assertEqual(results[0]["store_name"], "빵집B")
+
+    def test_wallet_rejects_crafted_cursor(self):
+        cursors = [
+            encode_cursor([{"a": 1}, 1]),
+            encode_cursor([[1], [2]]),
+            encode_cursor([1, 2]),  # 날짜 자리에 숫자
+            encode_cursor([timezone.now(), True]),
+            encode_cursor([timezone.now(), float("nan")]),
+            encode_cursor([timezone.now(), 2 ** 70]),
+            encode_cursor([timezone.now()]),
+            "not-a-cursor",
+        ]
+        for cursor in cursors:
+            response = self.client.get("/api/v1/coupons/wallet/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+
+    def test_daily_stats_follow_issue_and_use(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        self.issue()  # 중복 발급은 집계되지 않는다
+        self.client.post("/api/v1/coupons/use/", {"short_code": code}, format="json")
+
+        stat = CouponDailyStat.objects.get()
+        self.assertEqual((stat.partnership_slug, stat.date, stat.issued, stat.used), ("slugfora01", timezone.localdate(), 1, 1))
+
+        CouponDailyStat.objects.all().delete()
+        call_command("rebuild_coupon_daily_stats", stdout=StringIO())
+        stat = CouponDailyStat.objects.get()
+        self.assertEqual((stat.issued, stat.used), (1, 1))
+
+        # 배포 시 마이그레이션 백필도 같은 값을 만든다
+        CouponDailyStat.objects.all().delete()
+        import_module("coupons.migrations.0011_coupon_daily_stat").backfill_daily_stats(apps, None)
+        stat = CouponDailyStat.objects.get()
+        self.assertEqual((stat.issued, stat.used), (1, 1))
+
+    def test_daily_stats_rows_are_upserted_in_key_order(self):
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+
+        # 제출 순서와 무관하게 (slug, date) 순서로 잠근다
+        with capture_statements() as statements:
+            add_daily_stats({
+                ("slugforb01", today): (0, 1),
+                ("slugfora01", today): (0, 2),
+                ("slugfora01", yesterday): (0, 3),
+            })
+
+        keys = re.findall(r"\('(\w+)', '([\d-]+)'", statements.captured_queries[0]["sql"])
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(
+            list(CouponDailyStat.objects.order_by("partnership_slug", "date").values_list("used", flat=True)),
+            [3, 2, 1],
+        )
+
+    def test_use_rejects_mistyped_code_without_query(self):
+        code = self.issue().json()["data"]["coupon"]["short_code"]
+        typo = ("3" if code[0] == "2" else "2") + code[1:]
 
-# Create your tests here.
+        with self.assertNumQueries(0):
+            response = self.client.post("/api/v1/coupons/use/", {"short_code": typo}, format="json")
+        self.assertEqual(response.status_code, 404)
@@ -6,4 +6,6 @@ urlpatterns = [
     path("policy/", CouponPolicyView.as_view(), name="coupon-policy"),
     path("issue/", CouponIssueView.as_view(), name="coupon-issue"),
     path("use/", CouponUseView.as_view(), name="coupon-issue"),
+    path("use-batch/", CouponBatchUseView.as_view(), name="coupon-use-batch"),
+    path("wallet/", CouponWalletView.as_view(), name="coupon-wallet"),
 ]
\ No newline at end of file
@@ -4,28 +4,33 @@ from rest_framework.response import Response
 from rest_framework import status
 from .serializers import *
 from common.response import success, failure
-from common.utils import generate_short_code
+from common.utils import generate_short_code, is_valid_short_code
 from .models import CouponPolicy
-from stores.models import Store
+from common.enums import CouponStatus
 from partnerships.models import Partnership
 from django.db.models import Q
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from collections import Counter
 from datetime import timedelta
 from accounts.models import ConsumerUser
+from config.auth import get_owner_principal
+from .cache import resolve_issue_target
+from .limits import reserve_monthly_slot
+from .stats import add_daily_stats, record_issued, use_coupon
+from common.pagination import KeysetPaginator
 
 
 class CouponPolicyView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        try:
-            store = Store.objects.get(owner=request.user)
-        except Store.DoesNotExist:
+        principal = get_owner_principal(request)
+        if principal.store_id is None:
             return Response(failure(message="가게 정보가 없습니다."), status=404)
 
         try:
-            policy = CouponPolicy.objects.get(store=store)
+            policy = CouponPolicy.objects.get(store_id=principal.store_id)
         except CouponPolicy.DoesNotExist:
             return Response(failure(message="등록된 쿠폰 정책이 없습니다."), status=404)
 
@@ -49,19 +54,16 @@ class CouponPolicyView(APIView):
 
 
     def patch(self, request):
-        user = request.user
-
         # 1. 내 가게 찾기
-        try:
-            store = Store.objects.get(owner=user)
-        except Store.DoesNotExist:
+        store_id = get_owner_principal(request).store_id
+        if store_id is None:
             return Response(
                 failure(data={"store": "가게 정보가 존재하지 않습니다."}),
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         # 2. 내 가게 쿠폰 정책 조회 (MVP: 1개 고정)
-        policy = CouponPolicy.objects.filter(store=store).first()
+        policy = CouponPolicy.objects.filter(store_id=store_id).first()
         if not policy:
             return Response(
                 failure(data={"coupon_policy": "쿠폰 정책이 존재하지 않습니다."}),
@@ -70,7 +72,7 @@ class CouponPolicyView(APIView):
 
         # 3. 제휴 여부 확인 → active 또는 요청 상태면 수정 불가
         has_partnership = Partnership.objects.filter(
-            Q(store_a=store) | Q(store_b=store),
+            Q(store_a_id=store_id) | Q(store_b_id=store_id),
             status__in=["active", "pending"]   # ← 실제 enum 값에 맞게 수정
         ).exists()
 
@@ -95,6 +97,13 @@ class CouponPolicyView(APIView):
         )
     
 
+SHORT_CODE_ATTEMPTS = 3
+
+
+class MonthlyLimitReached(Exception):
+    pass
+
+
 class CouponIssueView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -112,55 +121,73 @@ class CouponIssueView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        partnership = Partnership.objects.filter(
-            models.Q(slug_for_a=slug) | models.Q(slug_for_b=slug),
-            status="active",
-        ).first()
+        # slug → (제휴, 대상 가게, 활성 정책) : 캐시 또는 조인 쿼리 1회
+        target = resolve_issue_target(slug)
 
-        if not partnership:
+        if not target:
             return Response(
                 failure(message="유효하지 않은 제휴입니다."),
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        if slug == partnership.slug_for_a:
-            target_store = partnership.store_b
-        else:
-            target_store = partnership.store_a
-
-        policy = CouponPolicy.objects.filter(store=target_store, is_active=True).first()
-        if not policy:
+        if not target["policy_id"]:
             return Response(
                 failure(message="발급 가능한 쿠폰 정책이 없습니다."),
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        today = timezone.now().date()
-
-        existing_coupon = Coupon.objects.filter(
-            user=request.user,
-            partnership_slug=slug,
-            issued_at__date=today,
-        ).first()
-
-        if existing_coupon:
-            serializer = CouponSerializer(existing_coupon)
+        # 하루 1장 제한은 (user, partnership_slug, issue_date) 유니크 제약으로 보장
+        # → 먼저 INSERT 하고, 제약에 걸리면 그때 오늘 발급분을 조회한다
+        # 월간 한도는 INSERT 와 같은 트랜잭션에서 카운터를 조건부 UPDATE 로 올려 보장
+        # (한도 초과나 중복이면 함께 롤백되어 카운터가 새지 않는다)
+        # 왕복: BEGIN + INSERT + 카운터 UPDATE + 일간 통계 upsert + COMMIT, 읽기 없음
+        today = timezone.localdate()
+
+        coupon = None
+        for _ in range(SHORT_CODE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    coupon = Coupon.objects.create(
+                        user=request.user,
+                        policy_id=target["policy_id"],
+                        short_code=generate_short_code(),
+                        partnership_slug=slug,          # ← 핵심
+                        issue_date=today,
+                        expired_at=timezone.now() + timedelta(hours=24),
+                    )
+                    if not reserve_monthly_slot(target["policy_id"], target.get("monthly_limit"), today):
+                        raise MonthlyLimitReached
+                    record_issued(slug, coupon.issued_at)
+                break
+            except MonthlyLimitReached:
+                return Response(
+                    failure(message="이번 달 쿠폰 발급 한도가 모두 소진되었습니다.", error_code="MONTHLY_LIMIT_REACHED"),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            except IntegrityError:
+                existing_coupon = Coupon.objects.with_effective_status().filter(
+                    user=request.user,
+                    partnership_slug=slug,
+                    issue_date=today,
+                ).first()
+
+                if existing_coupon:
+                    serializer = CouponSerializer(existing_coupon)
+                    return Response(
+                        success(
+                            data={"coupon": serializer.data},
+                            message="오늘 이미 발급된 쿠폰이 있습니다.",
+                        ),
+                        status=status.HTTP_200_OK,
+                    )
+                # 오늘 발급분이 없으면 short_code 충돌 → 새 번호로 다시 시도
+
+        if coupon is None:
             return Response(
-                success(
-                    data={"coupon": serializer.data},
-                    message="오늘 이미 발급된 쿠폰이 있습니다.",
-                ),
-                status=status.HTTP_200_OK,
+                failure(message="쿠폰 발급에 실패했습니다. 다시 시도해주세요.", error_code="COUPON_ISSUE_FAILED"),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        coupon = Coupon.objects.create(
-            user=request.user,
-            policy=policy,
-            short_code=generate_short_code(),
-            partnership_slug=slug,          # ← 핵심
-            expired_at=timezone.now() + timedelta(hours=24),
-        )
-
         serializer = CouponSerializer(coupon)
         return Response(
             success(data={"coupon": serializer.data}, message="쿠폰 발급 성공"),
@@ -187,39 +214,193 @@ class CouponUseView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        try:
-            coupon = Coupon.objects.get(short_code=short_code, user=request.user)
-        except Coupon.DoesNotExist:
+        # 검증 문자가 맞지 않는 번호는 DB 조회 없이 거절
+        if not is_valid_short_code(short_code):
             return Response(
                 failure(message="해당 쿠폰을 찾을 수 없습니다."),
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # 상태 검사
-        if coupon.status != "active":
+        # 활성 + 미만료일 때만 사용 처리: UPDATE ... RETURNING 한 번으로 검사, 변경, 응답 값 읽기를 같이 한다
+        # (동시에 두 번 눌러도 한 요청만 행을 바꾼다)
+        now = timezone.now()
+        with transaction.atomic():
+            coupon = use_coupon(short_code, request.user.id, now)
+
+        if coupon is None:
+            # 실패 사유를 알려주기 위해서만 조회
+            coupon = (
+                Coupon.objects.with_effective_status(now)
+                .filter(short_code=short_code, user=request.user)
+                .values("effective_status")
+                .first()
+            )
+
+            if coupon is None:
+                return Response(
+                    failure(message="해당 쿠폰을 찾을 수 없습니다."),
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            if coupon["effective_status"] == CouponStatus.EXPIRED.value:
+                return Response(
+                    failure(message="쿠폰이 만료되었습니다."),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
             return Response(
                 failure(message="이미 사용되었거나 만료된 쿠폰입니다."),
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 만료 여부 확인
-        if coupon.expired_at and coupon.expired_at < timezone.now():
-            coupon.status = "expired"
-            coupon.save(update_fields=["status"])
+        serializer = CouponSerializer(coupon)
+        return Response(
+            success(data={"coupon": serializer.data}, message="쿠폰이 사용되었습니다."),
+            status=status.HTTP_200_OK,
+        )
+
+
+
+# POS 단말 시계 오차 허용 범위 (사용 시각 검증용)
+USED_AT_CLOCK_SKEW = timedelta(minutes=5)
+
+
+class CouponBatchUseView(APIView):
+    """
+    POS 단말이 오프라인 동안 쌓아 둔 사용 내역을 한 번에 반영한다.
+    대상 쿠폰 조회 1회 + 조건부 UPDATE 1회를 한 트랜잭션에서 처리하고, 코드별 결과를 돌려준다.
+    같은 내역(코드 + 사용 시각)을 다시 보내도 결과가 같다.
+    사용 시각이 발급 전이거나 현재보다 뒤면(시계 오차 허용) invalid_time 으로 거절한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        store_id = get_owner_principal(request).store_id
+        if store_id is None:
+            return Response(
+                failure(message="가게 정보가 없습니다."),
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = CouponBatchUseSerializer(data=request.data)
+        if not serializer.is_valid():
             return Response(
-                failure(message="쿠폰이 만료되었습니다."),
+                failure(data=serializer.errors, message="사용 내역 형식이 올바르지 않습니다."),
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 사용 처리
-        coupon.status = "used"
-        coupon.used_at = timezone.now()
-        coupon.save(update_fields=["status", "used_at"])
+        # 같은 코드가 여러 번 오면 처음 것만 반영 (사용 시각은 단말 기록 그대로 → 재전송해도 동일)
+        redemptions = {}
+        for item in serializer.validated_data["redemptions"]:
+            redemptions.setdefault(item["short_code"], item["used_at"])
 
-        serializer = CouponSerializer(coupon)
+        results = {code: "not_found" for code in redemptions}
+        valid_codes = [code for code in redemptions if is_valid_short_code(code)]
+
+        now = timezone.now()
+
+        with transaction.atomic():
+            # 우리 가게가 혜택을 주는 쿠폰만 사용 처리할 수 있다
+            # (정책 행까지 잠그면 같은 정책의 발급이 배치 내내 막히므로 쿠폰 행만 잠근다)
+            coupons = list(
+                Coupon.objects.select_for_update(of=("self",))
+                .filter(short_code__in=valid_codes, policy__store_id=store_id)
+                .values("id", "short_code", "partnership_slug", "status", "issued_at", "used_at", "expired_at")
+            )
+
+            to_use = {}
+            slugs = {}
+            for coupon in coupons:
+                code = coupon["short_code"]
+                used_at = redemptions[code]
+
+                # 단말이 보낸 시각은 발급 시각 ~ 현재 사이여야 한다 (만료 판단을 피하려는 조작 방지)
+                if not (coupon["issued_at"] - USED_AT_CLOCK_SKEW <= used_at <= now + USED_AT_CLOCK_SKEW):
+                    results[code] = "invalid_time"
+                elif coupon["status"] == CouponStatus.USED.value:
+                    # 이미 같은 시각으로 반영된 내역이면 재전송 → 성공으로 응답
+                    results[code] = "used" if coupon["used_at"] == used_at else "already_used"
+                elif coupon["expired_at"] and coupon["expired_at"] <= used_at:
+                    results[code] = "expired"
+                else:
+                    # 오프라인 사용 시각이 만료 전이면 스위퍼가 이미 expired 로 바꿨어도 사용 처리
+                    to_use[coupon["id"]] = code
+                    slugs[code] = coupon["partnership_slug"]
+
+            if to_use:
+                Coupon.objects.filter(
+                    pk__in=to_use,
+                    status__in=[CouponStatus.ACTIVE.value, CouponStatus.EXPIRED.value],
+                ).update(
+                    status=CouponStatus.USED.value,
+                    used_at=models.Case(
+                        *[models.When(pk=pk, then=models.Value(redemptions[code])) for pk, code in to_use.items()],
+                        output_field=models.DateTimeField(),
+                    ),
+                )
+                # 일간 롤업도 (slug, 사용일) 별로 묶어 한 문장으로
+                daily = Counter(
+                    (slugs[code], timezone.localdate(redemptions[code])) for code in to_use.values()
+                )
+                add_daily_stats({key: (0, count) for key, count in daily.items()})
+
+                for code in to_use.values():
+                    results[code] = "used"
+
+        data = [
+            {"short_code": code, "result": results[code], "used_at": used_at}
+            for code, used_at in redemptions.items()
+        ]
         return Response(
-            success(data={"coupon": serializer.data}, message="쿠폰이 사용되었습니다."),
+            success(
+                data={"results": CouponBatchResultSerializer(data, many=True).data},
+                message="사용 내역이 반영되었습니다.",
+            ),
             status=status.HTTP_200_OK,
         )
-    
 
+
+
+class CouponWalletView(APIView):
+    """
+    소비자 쿠폰함. 최신 발급순으로 (issued_at, id) 키셋 페이지네이션.
+    ?status=active|used|expired, ?cursor=<이전 응답의 next 또는 previous>, ?page_size=
+    """
+    permission_classes = [IsAuthenticated]
+    paginator = KeysetPaginator(ordering=("-issued_at", "-id"))
+
+    def get(self, request):
+        if not isinstance(request.user, ConsumerUser):
+            return Response(
+                failure(message="소비자 계정만 쿠폰함을 볼 수 있습니다."),
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        queryset = (
+            Coupon.objects.with_effective_status()
+            .select_related("policy__store")
+            .filter(user=request.user)
+        )
+
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            if status_filter not in dict(CouponStatus.choices()):
+                return Response(
+                    failure(message="status 는 active, used, expired 중 하나여야 합니다."),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            queryset = queryset.filter(effective_status=status_filter)
+
+        try:
+            coupons, next_cursor, previous_cursor = self.paginator.paginate(queryset, request)
+        except ValueError:
+            return Response(
+                failure(message="잘못된 커서입니다."),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(success(data={
+            "next": next_cursor,
+            "previous": previous_cursor,
+            "results": CouponWalletSerializer(coupons, many=True).data,
+        }))
@@ -45,6 +45,20 @@ class Partnership(models.Model):
         return f"제휴: {self.store_a.name} ↔ {self.store_b.name} ({self.get_status_display()})"
 
 
+def is_partnered_expression(store_ref="pk"):
+    """
+    가게가 활성 제휴 중인지 (store_ref: 바깥 쿼리에서 가게 id 를 가리키는 필드).
+    store_a / store_b 각각의 EXISTS 로 나눠 두 FK 인덱스를 그대로 탄다.
+    annotate(is_partnered=...) 로 목록/상세 직렬화와 is_partnered 필터가 함께 쓴다.
+    """
+    active = Partnership.objects.filter(status=PartnershipStatus.ACTIVE.value)
+    return models.ExpressionWrapper(
+        models.Exists(active.filter(store_a_id=models.OuterRef(store_ref)))
+        | models.Exists(active.filter(store_b_id=models.OuterRef(store_ref))),
+        output_field=models.BooleanField(),
+    )
+
+
 
 
 class PartnershipChangeRequest(models.Model):
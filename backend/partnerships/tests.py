@@ -1,3 +1,121 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import OwnerUser, ConsumerUser
+from coupons.models import Coupon, CouponPolicy
+from coupons.stats import record_issued
+from partnerships.models import Partnership
+from stores.models import Store
+
+
+def make_store(username, name):
+    owner = OwnerUser.objects.create_user(username, "password", name=name, phone_number="01012345678")
+    return Store.objects.create(owner=owner, name=name, phone="0212345678", address="서울시 성동구")
+
+
+class PartnershipStatsTests(TestCase):
+    def setUp(self):
+        self.store_a = make_store("storea", "카페A")
+        self.store_b = make_store("storeb", "빵집B")
+        policy = CouponPolicy.objects.create(store=self.store_a, description="음료 1잔", expected_value=4000, monthly_limit=100)
+        Partnership.objects.create(
+            store_a=self.store_a,
+            store_b=self.store_b,
+            start_date=date.today(),
+            slug_for_a="slugfora01",
+            slug_for_b="slugforb01",
+        )
+
+        # slug_for_b 로 들어온 쿠폰 = store_a 의 쿠폰 → store_a 사장님이 통계를 본다
+        now = timezone.now()
+        for i, (days_ago, used) in enumerate([(0, True), (0, False), (3, True), (20, False)]):
+            consumer = ConsumerUser.objects.create(kakao_id=f"phone_0101111000{i}", phone_number=f"0101111000{i}")
+            coupon = Coupon.objects.create(
+                user=consumer,
+                policy=policy,
+                short_code=f"STATS{i:04d}",
+                partnership_slug="slugforb01",
+                expired_at=now + timedelta(days=1),
+            )
+            issued_at = now - timedelta(days=days_ago)
+            Coupon.objects.filter(pk=coupon.pk).update(
+                issued_at=issued_at,
+                status="used" if used else "active",
+                used_at=issued_at if used else None,
+            )
+
+        call_command("rebuild_coupon_daily_stats", stdout=StringIO())
+
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.store_a.owner)
+
+    def test_stats_summary_and_daily(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/partnerships/stats/", {"slug": "slugforb01", "range": "7d"})
+        self.assertEqual(response.status_code, 200)
+        # 가게 조회 + 제휴 조회 + 롤업 버전 + 롤업 요약 집계 + 롤업 일별 행
+        self.assertEqual(len(queries), 5)
+
+        data = response.json()["data"]
+        self.assertEqual(data["summary"]["total"], {"issued": 4, "used": 2, "conversion_rate": 50.0})
+        self.assertEqual(data["summary"]["last_7_days"]["issued"], 3)
+        self.assertEqual(data["summary"]["last_7_days"]["used"], 2)
+        self.assertEqual(len(data["daily"]), 7)
+        self.assertEqual(data["daily"][-1]["date"], str(timezone.localdate()))
+        self.assertEqual(sum(day["issued"] for day in data["daily"]), 3)
+        self.assertEqual(sum(day["used"] for day in data["daily"]), 2)
+
+    def test_stats_etag_changes_only_with_new_coupons(self):
+        url = "/api/v1/partnerships/stats/"
+        params = {"slug": "slugforb01", "range": "7d"}
+        etag = self.client.get(url, params)["ETag"]
+
+        # 같은 버전 → 304, 본문 집계 없음 (가게 + 제휴 + 롤업 버전 조회만)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 3)
+
+        record_issued("slugforb01")
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["summary"]["total"]["issued"], 5)
+
+    def test_store_rename_is_not_served_stale(self):
+        url = "/api/v1/partnerships/stats/"
+        params = {"slug": "slugforb01", "range": "7d"}
+        etag = self.client.get(url, params)["ETag"]
+
+        # 롤업은 그대로라 숫자 캐시는 다시 쓰지만, 이름은 매 요청 제휴 행에서 읽는다
+        self.store_b.name = "새빵집B"
+        self.store_b.save(update_fields=["name"])
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["partnership"]["store_b"], "새빵집B")
+        self.assertEqual(response.json()["data"]["summary"]["total"]["issued"], 4)
+
+    def test_rebuild_from_another_process_is_not_served_stale(self):
+        url = "/api/v1/partnerships/stats/"
+        params = {"slug": "slugforb01", "range": "7d"}
+        etag = self.client.get(url, params)["ETag"]
+
+        # 다른 프로세스의 재계산: 이 프로세스의 캐시는 건드리지 않고 DB 만 바뀐다
+        Coupon.objects.filter(short_code="STATS0001").delete()
+        call_command("rebuild_coupon_daily_stats", stdout=StringIO())
 
-# Create your tests here.
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["summary"]["total"]["issued"], 3)
@@ -5,16 +5,20 @@ from common.enums import ProposalStatus
 from common.s3 import generate_presigned_url
 from common.response import success, failure
 from .models import Proposal, Partnership
-from coupons.models import Coupon
+from coupons.models import CouponDailyStat
+from coupons.stats import STATS_CACHE_TIMEOUT, get_stats_version, stats_cache_key
+from django.core.cache import cache
 from .serializers import *
 from rest_framework import status
-from django.db.models import Count, Q
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 import qrcode
+import hashlib
 import io
 import boto3
-from django.db.models.functions import TruncDate
 from datetime import timedelta
 from django.utils import timezone
+from config.auth import get_owner_principal
 
 
 class ProposalCreateView(APIView):
@@ -76,23 +80,17 @@ class QRCodeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        principal = get_owner_principal(request)
 
         # 사장님 → 가게
-        try:
-            store = Store.objects.get(owner=user)
-        except Store.DoesNotExist:
+        if principal.store_id is None:
             return Response(
                 failure(message="가게 정보가 존재하지 않습니다."),
                 status=404,
             )
 
         # 내 가게가 참여한 활성 파트너쉽 조회
-        partnership = Partnership.objects.filter(
-            status="active"
-        ).filter(
-            models.Q(store_a=store) | models.Q(store_b=store)
-        ).first()
+        partnership = principal.get_active_partnership()
 
         if not partnership:
             return Response(
@@ -101,7 +99,7 @@ class QRCodeView(APIView):
             )
 
         # 🔥 slug / partner_slug 구분
-        if store == partnership.store_a:
+        if principal.store_id == partnership.store_a_id:
             my_slug = partnership.slug_for_a
             partner_slug = partnership.slug_for_b
         else:
@@ -207,7 +205,7 @@ class PartnershipStatsView(APIView):
         days = 30 if range_param == "30d" else 7
 
         # 1) Partnership 매칭
-        partnership = Partnership.objects.filter(
+        partnership = Partnership.objects.select_related("store_a", "store_b").filter(
             Q(slug_for_a=slug) | Q(slug_for_b=slug),
             status="active"
         ).first()
@@ -222,9 +220,9 @@ class PartnershipStatsView(APIView):
             )
 
         # 🔐 2) 접근 권한 확인 (본인 제휴인지)
-        owner_store = getattr(request.user, "store", None)
+        owner_store_id = get_owner_principal(request).store_id
 
-        if owner_store is None:
+        if owner_store_id is None:
             return Response(
                 failure(
                     message="서버와의 문제가 발생했습니다.",
@@ -235,7 +233,7 @@ class PartnershipStatsView(APIView):
 
         # owner = store_a → 허용 slug = slug_for_b
         # owner = store_b → 허용 slug = slug_for_a
-        if owner_store == partnership.store_a:
+        if owner_store_id == partnership.store_a_id:
             allowed_slug = partnership.slug_for_b
         else:
             allowed_slug = partnership.slug_for_a
@@ -251,7 +249,7 @@ class PartnershipStatsView(APIView):
             )
 
         # 본인 제휴가 아니면 차단
-        if partnership.store_a != owner_store and partnership.store_b != owner_store:
+        if partnership.store_a_id != owner_store_id and partnership.store_b_id != owner_store_id:
             return Response(
                 failure(
                     message="서버와의 문제가 발생했습니다.",
@@ -262,90 +260,93 @@ class PartnershipStatsView(APIView):
 
         # 🔥 여기까지 왔으면 본인 제휴 slug임 → 정상 처리
 
-        now = timezone.now()
-        start_date = now - timedelta(days=days)
-        days_30 = now - timedelta(days=30)
-        days_7 = now - timedelta(days=7)
-
-        # 3) 제휴별 쿠폰 전체 (summary 용)
-        all_coupons = Coupon.objects.filter(partnership_slug=slug)
-
-        # ----- SUMMARY: 전체 기간 -----
-        total_issued = all_coupons.count()
-        total_used = all_coupons.filter(status="used").count()
+        # 3) 통계 숫자는 해당 slug 의 롤업이 바뀔 때만 바뀐다
+        #    → 롤업 상태(버전)를 DB 에서 집계 1회로 읽고, 숫자(summary/daily)만 (slug, range, version) 으로 캐시
+        #    가게 이름은 매 요청 이미 읽은 제휴 행에서 붙이고, 이름이 바뀌면 ETag 도 바뀌게 한다
+        partnership_data = {
+            "slug": slug,
+            "store_a": partnership.store_a.name,
+            "store_b": partnership.store_b.name,
+        }
+        version = get_stats_version(slug)
+        names = hashlib.sha1(f"{partnership_data['store_a']}|{partnership_data['store_b']}".encode()).hexdigest()[:8]
+        etag = f'"{slug}-{days}-{timezone.localdate()}-{version}-{names}"'
 
-        issued_30 = all_coupons.filter(issued_at__gte=days_30).count()
-        used_30 = all_coupons.filter(status="used", used_at__gte=days_30).count()
+        # 브라우저가 저장해 두되 매번 ETag 로 재검증하도록
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-        issued_7 = all_coupons.filter(issued_at__gte=days_7).count()
-        used_7 = all_coupons.filter(status="used", used_at__gte=days_7).count()
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        def rate(i, u):
-            return round((u / i) * 100, 1) if i else 0
+        key = stats_cache_key(slug, days, version)
+        stats = cache.get(key)
+        if stats is None:
+            stats = self.build_stats(slug, days)
+            cache.set(key, stats, STATS_CACHE_TIMEOUT)
 
-        # ----- DAILY: 최근 days -----
-        range_coupons = all_coupons.filter(
-            issued_at__date__gte=start_date.date()
+        return Response(
+            success(data={"partnership": partnership_data, **stats}),
+            status=status.HTTP_200_OK,
+            headers=headers,
         )
 
-        issued_qs = range_coupons.annotate(
-            date=TruncDate("issued_at")
-        ).values("date").annotate(
-            issued=Count("id")
+    def build_stats(self, slug, days):
+        # 일간 롤업(CouponDailyStat, Asia/Seoul 날짜) 에서 읽는다 → 원본 쿠폰 행은 보지 않음
+        today = timezone.localdate()
+        start_date = today - timedelta(days=days - 1)
+        stats = CouponDailyStat.objects.filter(partnership_slug=slug)
+
+        # ----- SUMMARY: 전체/30일/7일 (오늘 포함) -----
+        summary = stats.aggregate(
+            total_issued=Coalesce(Sum("issued"), 0),
+            total_used=Coalesce(Sum("used"), 0),
+            issued_30=Coalesce(Sum("issued", filter=Q(date__gt=today - timedelta(days=30))), 0),
+            used_30=Coalesce(Sum("used", filter=Q(date__gt=today - timedelta(days=30))), 0),
+            issued_7=Coalesce(Sum("issued", filter=Q(date__gt=today - timedelta(days=7))), 0),
+            used_7=Coalesce(Sum("used", filter=Q(date__gt=today - timedelta(days=7))), 0),
         )
+        total_issued, total_used = summary["total_issued"], summary["total_used"]
+        issued_30, used_30 = summary["issued_30"], summary["used_30"]
+        issued_7, used_7 = summary["issued_7"], summary["used_7"]
 
-        used_qs = range_coupons.filter(
-            status="used"
-        ).annotate(
-            date=TruncDate("used_at")
-        ).values("date").annotate(
-            used=Count("id")
-        )
+        def rate(i, u):
+            return round((u / i) * 100, 1) if i else 0
 
-        issued_map = {row["date"]: row["issued"] for row in issued_qs}
-        used_map = {row["date"]: row["used"] for row in used_qs}
+        # ----- DAILY: 오늘까지 최근 days 일 (최대 30행) -----
+        daily_map = {
+            row["date"]: row
+            for row in stats.filter(date__gte=start_date).values("date", "issued", "used")
+        }
 
         daily = []
         for i in range(days):
-            d = (start_date + timedelta(days=i)).date()
+            d = start_date + timedelta(days=i)
+            row = daily_map.get(d, {"issued": 0, "used": 0})
             daily.append({
                 "date": str(d),
-                "issued": issued_map.get(d, 0),
-                "used": used_map.get(d, 0),
-                "conversion_rate": rate(
-                    issued_map.get(d, 0),
-                    used_map.get(d, 0)
-                ),
+                "issued": row["issued"],
+                "used": row["used"],
+                "conversion_rate": rate(row["issued"], row["used"]),
             })
 
-        return Response(
-            success(
-                data={
-                    "partnership": {
-                        "slug": slug,
-                        "store_a": partnership.store_a.name,
-                        "store_b": partnership.store_b.name,
-                    },
-                    "summary": {
-                        "total": {
-                            "issued": total_issued,
-                            "used": total_used,
-                            "conversion_rate": rate(total_issued, total_used),
-                        },
-                        "last_30_days": {
-                            "issued": issued_30,
-                            "used": used_30,
-                            "conversion_rate": rate(issued_30, used_30),
-                        },
-                        "last_7_days": {
-                            "issued": issued_7,
-                            "used": used_7,
-                            "conversion_rate": rate(issued_7, used_7),
-                        },
-                    },
-                    "daily_range": days,
-                    "daily": daily
-                }
-            ),
-            status=status.HTTP_200_OK
-        )
+        return {
+            "summary": {
+                "total": {
+                    "issued": total_issued,
+                    "used": total_used,
+                    "conversion_rate": rate(total_issued, total_used),
+                },
+                "last_30_days": {
+                    "issued": issued_30,
+                    "used": used_30,
+                    "conversion_rate": rate(issued_30, used_30),
+                },
+                "last_7_days": {
+                    "issued": issued_7,
+                    "used": used_7,
+                    "conversion_rate": rate(issued_7, used_7),
+                },
+            },
+            "daily_range": days,
+            "daily": daily,
+        }
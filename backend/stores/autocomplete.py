@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+import unicodedata
+import uuid
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import Store
+
+
+# 가게명 자동완성용 프로세스 내 접두어 색인.
+# 이름을 자모 단위로 풀어 (키, 가게 id) 정렬 배열에 넣고 bisect 로 찾으므로
+# "빵ㅈ" 처럼 조합 중인 글자도 "빵집" 에 걸린다. 요청 처리 중에는 DB 를 보지 않는다.
+# 전체 적재/재적재는 백그라운드 스레드가, 이 프로세스의 가게 변경은 signals 가 한 건씩 반영한다.
+
+logger = logging.getLogger(__name__)
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 입력창에 겹자모가 그대로 들어오는 경우 (ㄺ, ㅘ 등) 도 타자 순서대로 푼다
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+VERSION_KEY = "stores:autocomplete-version"
+POLL_INTERVAL = 5  # 다른 프로세스의 변경(캐시 버전)을 확인하는 간격 (초)
+
+
+def to_jamo(text):
+    """
+    소문자화 + 공백 제거 + 한글 음절을 자모 순서열로 분해. 예: "빵집" → "ㅃㅏㅇㅈㅣㅂ"
+    """
+    result = []
+    for ch in unicodedata.normalize("NFC", text).lower():
+        if ch.isspace():
+            continue
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(CHOSEONG[code // 588] + JUNGSEONG[(code % 588) // 28] + JONGSEONG[code % 28])
+        else:
+            result.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(result)
+
+
+def name_keys(name):
+    """
+    전체 이름 + 띄어쓰기 단위 각 단어부터 시작하는 키 (예: "성수 빵집" 은 "빵" 으로도 찾기)
+    """
+    words = name.split()
+    return {to_jamo("".join(words[i:])) for i in range(len(words))} - {""}
+
+
+class StoreNameIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []          # 정렬된 (키, 가게 id)
+        self._keys = {}             # 가게 id → 키 목록 (갱신 시 제거용)
+        self._names = {}            # 가게 id → 가게명
+        self._version = None
+        self._loaded_at = None
+        self._thread = None
+
+    def start(self):
+        """
+        백그라운드 갱신 스레드를 프로세스당 하나 띄운다. 기다리지 않으므로 요청 경로에서 불러도 되고,
+        첫 적재가 끝나기 전에는 빈 결과를 돌려준다.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="store-autocomplete", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh_if_stale()
+            except Exception:
+                logger.exception("가게명 자동완성 색인을 다시 읽지 못했습니다.")
+            finally:
+                connection.close()  # 이 스레드 전용 연결을 잡아 두지 않는다
+            time.sleep(POLL_INTERVAL)
+
+    def refresh_if_stale(self):
+        """
+        처음이거나, 다른 프로세스에서 가게가 바뀌었거나(캐시 버전 변경), 오래됐으면 DB 에서 다시 읽는다.
+        갱신 스레드에서 부른다. 다시 읽었으면 True.
+        """
+        version = cache.get(VERSION_KEY)
+        expired = self._loaded_at is None or time.monotonic() - self._loaded_at > settings.STORE_AUTOCOMPLETE_REFRESH
+        if not expired and version == self._version:
+            return False
+        self.rebuild(version)
+        return True
+
+    def rebuild(self, version=None):
+        stores = Store.objects.filter(is_active=True).values_list("id", "name")
+        entries, keys, names = [], {}, {}
+        for store_id, name in stores:
+            keys[store_id] = name_keys(name)
+            names[store_id] = name
+            entries.extend((key, store_id) for key in keys[store_id])
+        entries.sort()
+
+        with self._lock:
+            self._entries, self._keys, self._names = entries, keys, names
+            self._version = version
+            self._loaded_at = time.monotonic()
+
+    def update(self, store):
+        """
+        가게 하나만 반영 (Store 저장 signal). 다른 프로세스에 알리도록 버전도 바꾼다.
+        """
+        with self._lock:
+            self._remove(store.id)
+            if store.is_active:
+                self._keys[store.id] = name_keys(store.name)
+                self._names[store.id] = store.name
+                for key in self._keys[store.id]:
+                    insort(self._entries, (key, store.id))
+            self._version = self._bump()
+
+    def remove(self, store_id):
+        with self._lock:
+            self._remove(store_id)
+            self._version = self._bump()
+
+    def _remove(self, store_id):
+        for key in self._keys.pop(store_id, ()):
+            i = bisect_left(self._entries, (key, store_id))
+            if i < len(self._entries) and self._entries[i] == (key, store_id):
+                del self._entries[i]
+        self._names.pop(store_id, None)
+
+    def _bump(self):
+        version = uuid.uuid4().hex[:12]
+        cache.set(VERSION_KEY, version, None)
+        return version
+
+    def search(self, text, limit=10):
+        prefix = to_jamo(text)
+        if not prefix:
+            return []
+
+        results, seen = [], set()
+        with self._lock:
+            i = bisect_left(self._entries, (prefix,))
+            while i < len(self._entries) and len(results) < limit:
+                key, store_id = self._entries[i]
+                if not key.startswith(prefix):
+                    break
+                if store_id not in seen:
+                    seen.add(store_id)
+                    results.append({"id": store_id, "name": self._names[store_id]})
+                i += 1
+        return results
+
+
+store_name_index = StoreNameIndex()
@@ -0,0 +1,117 @@
+import re
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import StoreOpenInterval
+
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+OPEN_AT_PATTERN = re.compile(r"^(?:(mon|tue|wed|thu|fri|sat|sun)-)?(\d{2}):(\d{2})$")
+
+
+def _minutes(hhmm):
+    hour, minute = hhmm.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _day_spans(schedule):
+    """
+    하루 영업시간 → 그날 00:00 기준 분 구간 목록. 닫는 시각이 여는 시각 이전이면 자정을 넘긴 영업.
+    """
+    if not schedule or schedule.get("closed") or not schedule.get("open") or not schedule.get("close"):
+        return []
+
+    open_, close = _minutes(schedule["open"]), _minutes(schedule["close"])
+    if close <= open_:
+        close += DAY_MINUTES
+
+    spans = [(open_, close)]
+    if len(schedule.get("break") or []) == 2:
+        break_start, break_end = (_minutes(t) for t in schedule["break"])
+        if break_start < open_:
+            break_start += DAY_MINUTES
+        if break_end <= break_start:
+            break_end += DAY_MINUTES
+        spans = [(open_, min(close, break_start)), (max(open_, break_end), close)]
+
+    return [(start, end) for start, end in spans if start < end]
+
+
+def compile_business_hours(hours):
+    """
+    business_hours(JSON) → 겹치지 않게 합친 주간 분 구간 [(start, end), ...]
+    일요일 밤 영업처럼 주 끝을 넘는 구간은 월요일 앞쪽으로 나눠 담는다.
+    """
+    intervals = []
+    for i, day in enumerate(DAYS):
+        try:
+            spans = _day_spans((hours or {}).get(day))
+        except (AttributeError, TypeError, ValueError):
+            # 수정 API 는 형식 검사를 거치지 않으므로 잘못된 요일은 휴무로 본다
+            spans = []
+
+        for start, end in spans:
+            start, end = start + i * DAY_MINUTES, end + i * DAY_MINUTES
+            if end > WEEK_MINUTES:
+                intervals.append((0, end - WEEK_MINUTES))
+                end = WEEK_MINUTES
+            intervals.append((start, end))
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compile_store_hours(store):
+    """
+    가게 하나의 영업 구간을 다시 만든다 (Store 저장 signal / rebuild_store_hours)
+    """
+    intervals = compile_business_hours(store.business_hours)
+    with transaction.atomic():
+        StoreOpenInterval.objects.filter(store_id=store.id).delete()
+        StoreOpenInterval.objects.bulk_create(
+            [StoreOpenInterval(store_id=store.id, start=start, end=end) for start, end in intervals]
+        )
+
+
+def week_minute(dt=None):
+    local = timezone.localtime(dt)
+    return local.weekday() * DAY_MINUTES + local.hour * 60 + local.minute
+
+
+def parse_open_at(value):
+    """
+    "19:00" (오늘, Asia/Seoul) 또는 "fri-19:00" → 주간 분. 형식이 틀리면 None
+    """
+    match = OPEN_AT_PATTERN.match(value.strip().lower())
+    if not match:
+        return None
+
+    day, hour, minute = match.group(1), int(match.group(2)), int(match.group(3))
+    if hour > 23 or minute > 59:
+        return None
+
+    weekday = DAYS.index(day) if day else timezone.localdate().weekday()
+    return weekday * DAY_MINUTES + hour * 60 + minute
+
+
+def open_at_expression(minute, store_ref="store_id"):
+    """
+    주간 분 minute 에 영업 중인지 (store_ref: 바깥 쿼리의 가게 id 필드)
+    """
+    return Exists(
+        StoreOpenInterval.objects.filter(
+            store_id=OuterRef(store_ref),
+            start__lte=minute,
+            end__gt=minute,
+        )
+    )
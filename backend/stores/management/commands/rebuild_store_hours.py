@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from stores.hours import compile_store_hours
+from stores.models import Store
+
+
+class Command(BaseCommand):
+    help = "가게 영업시간(business_hours)을 주간 영업 구간(StoreOpenInterval)으로 다시 컴파일합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--store", type=int, help="해당 가게 id 만 재컴파일. 생략하면 전체")
+
+    def handle(self, *args, **options):
+        stores = Store.objects.order_by("id").only("id", "business_hours")
+        if options["store"]:
+            stores = stores.filter(id=options["store"])
+
+        count = 0
+        for store in stores.iterator():
+            compile_store_hours(store)
+            count += 1
+
+        self.stdout.write(f"가게 {count}곳 영업시간 재컴파일 완료")
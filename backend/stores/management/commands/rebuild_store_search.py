@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from stores.models import Store
+from stores.search import index_store
+
+
+class Command(BaseCommand):
+    help = "가게명/주소/쿠폰 설명으로 게시글 검색 n-gram 색인을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--store", type=int, help="해당 가게 id 만 재색인. 생략하면 전체")
+
+    def handle(self, *args, **options):
+        stores = Store.objects.order_by("id")
+        if options["store"]:
+            stores = stores.filter(id=options["store"])
+
+        count = 0
+        for store in stores.iterator():
+            index_store(store)
+            count += 1
+
+        self.stdout.write(f"가게 {count}곳 재색인 완료")
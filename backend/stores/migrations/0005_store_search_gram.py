@@ -0,0 +1,108 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:35
+
+import re
+import unicodedata
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# 마이그레이션 시점의 색인 규칙 (stores.search 에서 복사). 나중에 색인 규칙이 바뀌어도
+# 이 마이그레이션의 결과는 바뀌지 않도록 앱 코드를 import 하지 않는다.
+
+FIELD_WEIGHTS = {"name": 3, "description": 2, "address": 1}
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return TOKEN_PATTERN.findall(text)
+
+
+def grams_of(token):
+    if len(token) == 1:
+        return {token}
+    return {token[i:i + n] for n in (2, 3) for i in range(len(token) - n + 1)}
+
+
+def store_grams(store, descriptions):
+    weights = Counter()
+    fields = {
+        "name": [store.name],
+        "address": [store.address],
+        "description": descriptions,
+    }
+    for field, texts in fields.items():
+        for text in texts:
+            for token in tokenize(text):
+                for gram in grams_of(token):
+                    weights[gram] += FIELD_WEIGHTS[field]
+    return weights
+
+
+def backfill_search_grams(apps, schema_editor):
+    """
+    기존 가게를 색인한다 (rebuild_store_search 와 같은 결과). 비워 두면 배포 직후
+    q= 검색이 아무것도 찾지 못한다.
+    """
+    Store = apps.get_model("stores", "Store")
+    CouponPolicy = apps.get_model("coupons", "CouponPolicy")
+    StoreSearchGram = apps.get_model("stores", "StoreSearchGram")
+
+    descriptions = {}
+    for store_id, description in CouponPolicy.objects.filter(is_active=True).values_list("store_id", "description"):
+        descriptions.setdefault(store_id, []).append(description)
+
+    for store in Store.objects.only("id", "name", "address").iterator():
+        weights = store_grams(store, descriptions.get(store.id, []))
+        StoreSearchGram.objects.bulk_create(
+            [StoreSearchGram(store_id=store.id, gram=gram, weight=weight) for gram, weight in weights.items()],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0004_alter_store_image_url"),
+        ("coupons", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoreSearchGram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=3)),
+                ("weight", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_grams",
+                        to="stores.store",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["gram", "store"], name="store_search_gram_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("store", "gram"), name="unique_store_gram"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_search_grams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# 마이그레이션 시점의 컴파일 규칙 (stores.hours 에서 복사). 나중에 규칙이 바뀌어도
+# 이 마이그레이션의 결과는 바뀌지 않도록 앱 코드를 import 하지 않는다.
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+
+def _minutes(hhmm):
+    hour, minute = hhmm.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _day_spans(schedule):
+    if not schedule or schedule.get("closed") or not schedule.get("open") or not schedule.get("close"):
+        return []
+
+    open_, close = _minutes(schedule["open"]), _minutes(schedule["close"])
+    if close <= open_:
+        close += DAY_MINUTES
+
+    spans = [(open_, close)]
+    if len(schedule.get("break") or []) == 2:
+        break_start, break_end = (_minutes(t) for t in schedule["break"])
+        if break_start < open_:
+            break_start += DAY_MINUTES
+        if break_end <= break_start:
+            break_end += DAY_MINUTES
+        spans = [(open_, min(close, break_start)), (max(open_, break_end), close)]
+
+    return [(start, end) for start, end in spans if start < end]
+
+
+def compile_business_hours(hours):
+    intervals = []
+    for i, day in enumerate(DAYS):
+        try:
+            spans = _day_spans((hours or {}).get(day))
+        except (AttributeError, TypeError, ValueError):
+            spans = []
+
+        for start, end in spans:
+            start, end = start + i * DAY_MINUTES, end + i * DAY_MINUTES
+            if end > WEEK_MINUTES:
+                intervals.append((0, end - WEEK_MINUTES))
+                end = WEEK_MINUTES
+            intervals.append((start, end))
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def backfill_open_intervals(apps, schema_editor):
+    """
+    기존 가게의 영업시간을 주간 구간으로 컴파일한다 (rebuild_store_hours 와 같은 결과).
+    비워 두면 배포 직후 open_now / open_at 필터에 아무 가게도 걸리지 않는다.
+    """
+    Store = apps.get_model("stores", "Store")
+    StoreOpenInterval = apps.get_model("stores", "StoreOpenInterval")
+
+    for store in Store.objects.only("id", "business_hours").iterator():
+        StoreOpenInterval.objects.bulk_create(
+            [
+                StoreOpenInterval(store_id=store.id, start=start, end=end)
+                for start, end in compile_business_hours(store.business_hours)
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0005_store_search_gram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoreOpenInterval",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.PositiveIntegerField()),
+                ("end", models.PositiveIntegerField()),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="open_intervals",
+                        to="stores.store",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["store", "start", "end"], name="store_open_interval_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_open_intervals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:51
+
+import stores.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0006_store_open_interval"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="store",
+            name="claims_version",
+            field=models.CharField(
+                default=stores.models.new_claims_version, editable=False, max_length=12
+            ),
+        ),
+    ]
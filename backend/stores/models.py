@@ -1,7 +1,12 @@
+import uuid
 from django.db import models
 from accounts.models import OwnerUser
 from common.enums import StoreCategory
 
+
+def new_claims_version():
+    return uuid.uuid4().hex[:12]
+
 class Store(models.Model):
     owner = models.OneToOneField(
         OwnerUser,
@@ -40,5 +45,44 @@ class Store(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 사장님 access 토큰 클레임 버전 (accounts.cache 에서 관리, 바뀌면 기존 클레임 토큰 거절)
+    claims_version = models.CharField(max_length=12, default=new_claims_version, editable=False)
+
     def __str__(self):
         return f"{self.name} ({self.owner.username})"
+
+
+
+class StoreSearchGram(models.Model):
+    """
+    게시글 검색용 n-gram 역색인. 가게명/주소/쿠폰 설명을 2·3글자 단위로 잘라
+    필드 가중치(가게명 3, 쿠폰 설명 2, 주소 1)를 더해 둔다. (stores.search 에서 관리)
+    """
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name="search_grams")
+    gram = models.CharField(max_length=3)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["gram", "store"], name="store_search_gram_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["store", "gram"], name="unique_store_gram"),
+        ]
+
+
+
+class StoreOpenInterval(models.Model):
+    """
+    business_hours 를 컴파일한 주간 영업 구간. 월요일 00:00 부터 센 분 단위 [start, end).
+    자정을 넘기는 영업은 다음 날로 이어지고 브레이크 타임은 빠진다. (stores.hours 에서 관리)
+    """
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name="open_intervals")
+    start = models.PositiveIntegerField()
+    end = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["store", "start", "end"], name="store_open_interval_idx"),
+        ]
+
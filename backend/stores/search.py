@@ -0,0 +1,103 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+
+from coupons.models import CouponPolicy
+from .models import StoreSearchGram
+
+
+# 한국어는 띄어쓰기가 일정하지 않아 형태소 대신 2·3글자 조각(n-gram)으로 색인한다.
+# DB 확장(pg_trgm 등) 없이 일반 B-tree 인덱스만 쓰므로 SQLite / PostgreSQL 모두 동작.
+
+FIELD_WEIGHTS = {"name": 3, "description": 2, "address": 1}
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return TOKEN_PATTERN.findall(text)
+
+
+def grams_of(token):
+    """
+    2·3글자 조각. 한 글자 토큰은 그대로 한 조각.
+    """
+    if len(token) == 1:
+        return {token}
+    return {token[i:i + n] for n in (2, 3) for i in range(len(token) - n + 1)}
+
+
+def store_grams(store, descriptions):
+    weights = Counter()
+    fields = {
+        "name": [store.name],
+        "address": [store.address],
+        "description": descriptions,
+    }
+    for field, texts in fields.items():
+        for text in texts:
+            for token in tokenize(text):
+                for gram in grams_of(token):
+                    weights[gram] += FIELD_WEIGHTS[field]
+    return weights
+
+
+def index_store(store):
+    """
+    가게 하나의 색인을 다시 만든다 (가게 / 쿠폰 정책 저장 시 signals 에서 호출)
+    """
+    descriptions = list(
+        CouponPolicy.objects.filter(store_id=store.id, is_active=True).values_list("description", flat=True)
+    )
+    weights = store_grams(store, descriptions)
+
+    with transaction.atomic():
+        StoreSearchGram.objects.filter(store_id=store.id).delete()
+        StoreSearchGram.objects.bulk_create(
+            [StoreSearchGram(store_id=store.id, gram=gram, weight=weight) for gram, weight in weights.items()]
+        )
+
+
+def search_posts(queryset, q, keep_order=False):
+    """
+    CouponPolicy 목록을 q 로 거르고 관련도(일치한 조각 가중치 합) 순으로 정렬한다.
+    질의 조각의 절반 이상이 맞는 가게만 남긴다. keep_order 면 기존 정렬 유지.
+    """
+    grams = set()
+    prefixes = set()
+    for token in tokenize(q):
+        if len(token) == 1:
+            prefixes.add(token)  # 한 글자는 그 글자로 시작하는 조각 모두
+        else:
+            grams |= grams_of(token)
+
+    if not grams and not prefixes:
+        return queryset
+
+    condition = Q(gram__in=grams)
+    for prefix in prefixes:
+        condition |= Q(gram__startswith=prefix)
+
+    # 역색인에서 조각 인덱스로 맞는 가게만 한 번에 묶는다 (가게별 일치 조각 수 / 가중치 합)
+    required = math.ceil(len(grams) / 2) if grams else 1
+    hits = (
+        StoreSearchGram.objects.filter(condition)
+        .values("store_id")
+        .annotate(hits=Count("id"), score=Sum("weight"))
+        .filter(hits__gte=required)
+    )
+
+    # 비상관 서브쿼리 하나로 거른다 (목록 COUNT 에도 이 조건만 들어간다)
+    queryset = queryset.filter(store_id__in=hits.values("store_id"))
+    if keep_order:
+        return queryset
+
+    # 관련도는 걸러진 행에 대해서만 같은 묶음에서 가게 하나를 찾아 붙인다
+    score = hits.filter(store_id=OuterRef("store_id")).values("score")
+    return queryset.annotate(
+        search_score=Subquery(score, output_field=IntegerField()),
+    ).order_by("-search_score", "-updated_at", "-id")
@@ -1,9 +1,7 @@
 from rest_framework import serializers
 from coupons.models import CouponPolicy
-from partnerships.models import Partnership
 from .models import Store
 from common.enums import StoreCategory
-from django.db import models
 
 class StoreSignupSerializer(serializers.ModelSerializer):
     class Meta:
@@ -89,7 +87,7 @@ class PostSerializer(serializers.ModelSerializer):
     store_name = serializers.CharField(source="store.name", read_only=True)
     owner_name = serializers.CharField(source="store.owner.name", read_only=True)
     category = serializers.CharField(source="store.category", read_only=True)
-    is_partnered = serializers.SerializerMethodField()
+    is_partnered = serializers.BooleanField(read_only=True)  # is_partnered_expression 주석값
 
     class Meta:
         model = CouponPolicy
@@ -106,13 +104,6 @@ class PostSerializer(serializers.ModelSerializer):
             "is_partnered",
         ]
 
-    def get_is_partnered(self, obj):
-        return Partnership.objects.filter(
-            status="active"
-        ).filter(
-            models.Q(store_a=obj.store) | models.Q(store_b=obj.store)
-        ).exists()
-
 
 
 
@@ -120,7 +111,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
     owner_name = serializers.CharField(source="owner.name", read_only=True)
     category = serializers.CharField(read_only=True)
     business_hours = serializers.JSONField()
-    is_partnered = serializers.SerializerMethodField()
+    is_partnered = serializers.BooleanField(read_only=True)  # is_partnered_expression 주석값
 
     # 쿠폰 정책 정보
     description = serializers.SerializerMethodField()
@@ -150,10 +141,13 @@ class PostDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_coupon(self, store):
-        try:
-            return CouponPolicy.objects.get(store=store, is_active=True)
-        except CouponPolicy.DoesNotExist:
-            return None
+        """
+        활성 쿠폰 정책. 필드 다섯 개가 같은 정책을 보므로 가게 객체당 한 번만 구한다.
+        PostDetailView 는 active_policies 로 미리 가져오므로 쿼리가 없다.
+        """
+        if not hasattr(store, "active_policies"):
+            store.active_policies = list(store.coupon_policies.filter(is_active=True)[:1])
+        return store.active_policies[0] if store.active_policies else None
 
     def get_description(self, store):
         policy = self.get_coupon(store)
@@ -174,10 +168,3 @@ class PostDetailSerializer(serializers.ModelSerializer):
     def get_coupon_updated_at(self, store):
         policy = self.get_coupon(store)
         return policy.updated_at if policy else None
-
-    def get_is_partnered(self, store):
-        return Partnership.objects.filter(
-            status="active"
-        ).filter(
-            models.Q(store_a=store) | models.Q(store_b=store)
-        ).exists()
\ No newline at end of file
@@ -0,0 +1,101 @@
+from copy import deepcopy
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from coupons.models import CouponPolicy
+from .models import Store
+from .search import index_store
+from .autocomplete import store_name_index
+from .hours import compile_store_hours
+
+
+# 가게명/주소/쿠폰 설명이 바뀌면 검색 색인을 다시 만든다.
+
+INDEXED_STORE_FIELDS = {"name", "address"}
+AUTOCOMPLETE_FIELDS = {"name", "is_active"}
+
+
+def reindex_store_id(store_id):
+    store = Store.objects.filter(id=store_id).first()
+    if store:
+        index_store(store)
+
+
+# 색인/구간을 다시 만들 필드는 불러온 시점 값과 비교해 실제로 바뀐 경우에만 처리한다.
+# (StoreUpdateView 처럼 update_fields 없이 save() 해도 전화번호만 바뀌면 건너뜀)
+
+TRACKED_STORE_FIELDS = INDEXED_STORE_FIELDS | {"business_hours"}
+
+
+@receiver(post_init, sender=Store)
+def remember_loaded_fields(sender, instance, **kwargs):
+    # 지연 로딩(defer/only)된 필드는 조회하지 않는다 → 비교 대상에서 빠지고 "바뀜"으로 본다
+    instance._loaded_fields = {
+        name: deepcopy(instance.__dict__[name])
+        for name in TRACKED_STORE_FIELDS
+        if name in instance.__dict__
+    }
+
+
+def changed_fields(instance, fields, created, update_fields):
+    if created:
+        return set(fields)
+    if update_fields is not None:
+        fields = fields & set(update_fields)
+
+    loaded = instance._loaded_fields
+    return {
+        name for name in fields
+        if name not in loaded or loaded[name] != instance.__dict__.get(name)
+    }
+
+
+@receiver(post_save, sender=Store)
+def reindex_store(sender, instance, created=False, update_fields=None, **kwargs):
+    if not changed_fields(instance, INDEXED_STORE_FIELDS, created, update_fields):
+        return
+    index_store(instance)
+
+
+@receiver(post_save, sender=CouponPolicy)
+def reindex_policy_store(sender, instance, **kwargs):
+    reindex_store_id(instance.store_id)
+
+
+@receiver(post_delete, sender=CouponPolicy)
+def reindex_deleted_policy_store(sender, instance, **kwargs):
+    # 가게 삭제로 함께 지워지는 경우가 있으므로 커밋 후 가게가 남아 있을 때만
+    store_id = instance.store_id
+    transaction.on_commit(lambda: reindex_store_id(store_id))
+
+
+# 자동완성 색인은 커밋된 변경만 반영 (롤백된 이름이 남지 않도록)
+
+@receiver(post_save, sender=Store)
+def update_autocomplete(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not AUTOCOMPLETE_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(lambda: store_name_index.update(instance))
+
+
+@receiver(post_delete, sender=Store)
+def remove_autocomplete(sender, instance, **kwargs):
+    store_id = instance.id
+    transaction.on_commit(lambda: store_name_index.remove(store_id))
+
+
+# 영업시간이 바뀌면 주간 영업 구간을 다시 컴파일
+
+@receiver(post_save, sender=Store)
+def recompile_hours(sender, instance, created=False, update_fields=None, **kwargs):
+    if not changed_fields(instance, {"business_hours"}, created, update_fields):
+        return
+    compile_store_hours(instance)
+
+
+# 위 receiver 들이 모두 비교한 뒤에 저장된 값을 새 기준으로 삼는다 (가장 마지막에 등록)
+
+@receiver(post_save, sender=Store)
+def refresh_loaded_fields(sender, instance, **kwargs):
+    remember_loaded_fields(sender, instance)
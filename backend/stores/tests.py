@@ -1,3 +1,313 @@
+import threading
+from datetime import date
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import OwnerUser
+from common.pagination import encode_cursor
+from coupons.models import CouponPolicy
+from partnerships.models import Partnership
+from stores.autocomplete import VERSION_KEY, StoreNameIndex, store_name_index
+from stores.hours import compile_business_hours
+from stores.models import Store, StoreOpenInterval, StoreSearchGram
+
+
+def make_store(username, name):
+    owner = OwnerUser.objects.create_user(username, "password", name=name, phone_number="01012345678")
+    return Store.objects.create(owner=owner, name=name, phone="0212345678", address="서울시 성동구")
+
+
+class PostListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_store("viewer", "구경하는가게").owner)
+
+    def add_posts(self, count, start=0):
+        stores = []
+        for i in range(start, start + count):
+            store = make_store(f"store{i}", f"가게{i}")
+            CouponPolicy.objects.create(store=store, description="음료 1잔", expected_value=4000, monthly_limit=100)
+            stores.append(store)
+        return stores
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/stores/posts/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_list_query_count_is_constant(self):
+        stores = self.add_posts(3)
+        Partnership.objects.create(
+            store_a=stores[0],
+            store_b=stores[1],
+            start_date=date.today(),
+            slug_for_a="slugfora01",
+            slug_for_b="slugforb01",
+        )
+        response, few = self.list_queries()
+
+        self.add_posts(9, start=3)
+        _, full_page = self.list_queries()
+
+        # COUNT + 목록 (is_partnered 는 EXISTS 주석값)
+        self.assertEqual(few, 2)
+        self.assertEqual(full_page, few)
+
+        partnered = {row["store_name"]: row["is_partnered"] for row in response.json()["data"]["results"]}
+        self.assertEqual(partnered, {"가게0": True, "가게1": True, "가게2": False})
+
+    def test_is_partnered_filter_runs_in_sql(self):
+        stores = self.add_posts(3)
+        Partnership.objects.create(
+            store_a=stores[0],
+            store_b=stores[1],
+            start_date=date.today(),
+            slug_for_a="slugfora01",
+            slug_for_b="slugforb01",
+        )
+
+        for value, expected in [("true", {"가게0", "가게1"}), ("false", {"가게2"})]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/api/v1/stores/posts/", {"is_partnered": value})
+            names = {row["store_name"] for row in response.json()["data"]["results"]}
+            self.assertEqual(names, expected)
+            self.assertEqual(len(queries), 2)  # 제휴 id 목록을 따로 읽지 않는다
+
+    def test_detail_loads_policy_once(self):
+        store = self.add_posts(1)[0]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/v1/stores/post/{store.id}/")
+        self.assertEqual(response.status_code, 200)
+        # 가게(+is_partnered) 1회 + 활성 정책 prefetch 1회
+        self.assertLessEqual(len(queries), 2)
+
+        data = response.json()["data"]
+        self.assertEqual(data["expected_value"], 4000)
+        self.assertEqual(data["monthly_limit"], 100)
+        self.assertFalse(data["is_partnered"])
+
+    def test_cursor_mode_pages_both_ways(self):
+        self.add_posts(5)
+
+        def page(cursor=""):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/api/v1/stores/posts/", {"cursor": cursor, "page_size": 2})
+            self.assertEqual(len(queries), 1)  # COUNT(*) 없음
+            data = response.json()["data"]
+            return [row["store_name"] for row in data["results"]], data
+
+        first, data = page()
+        self.assertEqual(first, ["가게4", "가게3"])
+        self.assertIsNone(data["previous"])
+
+        second, data = page(data["next"])
+        self.assertEqual(second, ["가게2", "가게1"])
+
+        back, data = page(data["previous"])
+        self.assertEqual(back, first)
+        self.assertIsNone(data["previous"])
+
+    def test_cursor_mode_rejects_crafted_cursor(self):
+        self.add_posts(1)
+
+        for cursor in (encode_cursor([{"a": 1}, 1]), encode_cursor([[1], [2]]), encode_cursor(["x", None])):
+            response = self.client.get("/api/v1/stores/posts/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+
+    def test_search_ranks_by_ngram_relevance(self):
+        bakery = make_store("bakery", "성수빵집")
+        CouponPolicy.objects.create(store=bakery, description="식빵 증정", expected_value=3000, monthly_limit=100)
+        cafe = make_store("cafe", "카페모카")
+        CouponPolicy.objects.create(store=cafe, description="빵집 할인 쿠폰", expected_value=3000, monthly_limit=100)
+        other = make_store("other", "꽃가게")
+        CouponPolicy.objects.create(store=other, description="꽃 한 송이", expected_value=3000, monthly_limit=100)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/stores/posts/", {"q": "빵집"})
+        self.assertEqual(len(queries), 2)
+
+        names = [row["store_name"] for row in response.json()["data"]["results"]]
+        self.assertEqual(names, ["성수빵집", "카페모카"])  # 가게명 일치가 설명 일치보다 위
+
+        # 가게명이 바뀌면 색인도 바뀐다
+        other.name = "동네빵집"
+        other.save()
+        response = self.client.get("/api/v1/stores/posts/", {"q": "빵집"})
+        self.assertIn("동네빵집", [row["store_name"] for row in response.json()["data"]["results"]])
+
+        # 배포 시 마이그레이션 백필이 같은 색인을 만든다
+        indexed = sorted(StoreSearchGram.objects.values_list("store_id", "gram", "weight"))
+        StoreSearchGram.objects.all().delete()
+        import_module("stores.migrations.0005_store_search_gram").backfill_search_grams(apps, None)
+        self.assertEqual(sorted(StoreSearchGram.objects.values_list("store_id", "gram", "weight")), indexed)
+
+
+    def test_save_reindexes_only_when_indexed_fields_change(self):
+        store = make_store("bakery", "성수빵집")
+        gram_table = StoreSearchGram._meta.db_table
+
+        def gram_queries(queries):
+            return [q for q in queries.captured_queries if gram_table in q["sql"]]
+
+        # update_fields 없이 저장해도 이름/주소가 그대로면 색인을 다시 만들지 않는다
+        store = Store.objects.get(id=store.id)
+        store.phone = "0298765432"
+        with CaptureQueriesContext(connection) as queries:
+            store.save()
+        self.assertEqual(gram_queries(queries), [])
+
+        store.address = "서울시 성동구 성수동"
+        with CaptureQueriesContext(connection) as queries:
+            store.save()
+        self.assertNotEqual(gram_queries(queries), [])
+
+        # 바뀐 값이 새 기준이 된다
+        with CaptureQueriesContext(connection) as queries:
+            store.save(update_fields=["name", "address"])
+        self.assertEqual(gram_queries(queries), [])
+
+
+class StoreAutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_store("bakery", "성수 빵집")
+        make_store("cafe", "빵카페")
+        make_store("flower", "꽃가게")
+        store_name_index.rebuild()
+
+        # 갱신 스레드는 띄우지 않는다 (테스트 트랜잭션 밖 연결로 DB 를 보게 되므로)
+        self.real_start = StoreNameIndex.start
+        patcher = mock.patch.object(StoreNameIndex, "start")
+        self.start = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.client.force_authenticate(OwnerUser.objects.get(username="flower"))
+
+    def complete(self, q):
+        response = self.client.get("/api/v1/stores/autocomplete/", {"q": q})
+        return [row["name"] for row in response.json()["data"]]
+
+    def test_partial_syllable_and_word_start(self):
+        with CaptureQueriesContext(connection) as queries:
+            names = self.complete("빵ㅈ")
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(names, ["성수 빵집"])
+
+        self.assertEqual(sorted(self.complete("빠")), ["빵카페", "성수 빵집"])
+        self.assertEqual(self.complete("ㄲ"), ["꽃가게"])
+
+    def test_store_save_updates_index(self):
+        store = Store.objects.get(name="꽃가게")
+        with self.captureOnCommitCallbacks(execute=True):
+            store.name = "닭갈비집"
+            store.save()
+
+        self.assertEqual(self.complete("닭"), ["닭갈비집"])
+        self.assertEqual(self.complete("달"), ["닭갈비집"])  # 겹받침 입력 중
+        self.assertEqual(self.complete("꽃"), [])
+
+
+    def test_cold_index_never_queries_on_request(self):
+        with mock.patch("stores.views.store_name_index", StoreNameIndex()):
+            with CaptureQueriesContext(connection) as queries:
+                names = self.complete("빵")
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(names, [])  # 첫 적재 전에는 빈 결과
+        self.start.assert_called_once()
+
+    def test_refresh_only_when_stale(self):
+        index = StoreNameIndex()
+        self.assertTrue(index.refresh_if_stale())
+        self.assertEqual([row["name"] for row in index.search("꽃")], ["꽃가게"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(index.refresh_if_stale())
+        self.assertEqual(len(queries), 0)
+
+        # 다른 프로세스가 버전을 바꾸면 다시 읽는다
+        cache.set(VERSION_KEY, "other", None)
+        self.assertTrue(index.refresh_if_stale())
+
+    def test_start_runs_one_background_thread(self):
+        index = StoreNameIndex()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with mock.patch.object(index, "_run", release.wait):
+            self.real_start(index)
+            thread = index._thread
+            self.real_start(index)
+
+        self.assertIs(index._thread, thread)
+        self.assertTrue(thread.daemon)
+        release.set()
+        thread.join(timeout=1)
+
+
+class BusinessHoursTests(TestCase):
+    HOURS = {
+        "mon": {"open": "10:00", "close": "20:00", "break": ["14:00", "16:00"]},
+        "fri": {"open": "18:00", "close": "02:00"},
+        "sun": {"open": "22:00", "close": "03:00"},
+        "wed": {"closed": True},
+    }
+
+    def test_compile_business_hours(self):
+        self.assertEqual(compile_business_hours(self.HOURS), [
+            (0, 180),                      # 일요일 밤 → 월요일 03:00 까지
+            (600, 840), (960, 1200),       # 월 10-14, 16-20
+            (4 * 1440 + 1080, 5 * 1440 + 120),
+            (6 * 1440 + 1320, 7 * 1440),
+        ])
+
+    def test_open_at_filter(self):
+        store = make_store("pub", "심야포차")
+        store.business_hours = self.HOURS
+        store.save()
+        CouponPolicy.objects.create(store=store, description="안주 1개", expected_value=5000, monthly_limit=100)
+
+        client = APIClient()
+        client.force_authenticate(store.owner)
+
+        def names(open_at):
+            response = client.get("/api/v1/stores/posts/", {"open_at": open_at})
+            return [row["store_name"] for row in response.json()["data"]["results"]]
+
+        self.assertEqual(names("sat-01:30"), ["심야포차"])  # 금요일 밤 영업
+        self.assertEqual(names("mon-15:00"), [])            # 브레이크 타임
+        self.assertEqual(names("mon-02:00"), ["심야포차"])  # 일요일 밤에서 이어짐
+        self.assertEqual(client.get("/api/v1/stores/posts/", {"open_at": "25:00"}).status_code, 400)
+
+        # 배포 시 마이그레이션 백필도 같은 구간을 만든다
+        StoreOpenInterval.objects.all().delete()
+        import_module("stores.migrations.0006_store_open_interval").backfill_open_intervals(apps, None)
+        self.assertEqual(names("sat-01:30"), ["심야포차"])
+        self.assertEqual(names("mon-15:00"), [])
+
+
+    def test_save_recompiles_only_when_hours_change(self):
+        store = make_store("pub", "심야포차")
+        store.business_hours = self.HOURS
+        store.save()
+
+        # 전화번호만 바꾸면 UPDATE 한 문장 (색인/영업 구간은 그대로)
+        store = Store.objects.get(id=store.id)
+        store.phone = "0298765432"
+        with CaptureQueriesContext(connection) as queries:
+            store.save()
+        self.assertEqual(len(queries), 1)
 
-# Create your tests here.
+        # 불러온 dict 를 직접 고쳐도 바뀐 것으로 본다
+        store.business_hours["wed"] = {"open": "10:00", "close": "12:00"}
+        store.save()
+        self.assertTrue(StoreOpenInterval.objects.filter(store=store, start=2 * 1440 + 600).exists())
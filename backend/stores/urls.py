@@ -5,4 +5,5 @@ urlpatterns = [
     path("owner-store/", StoreUpdateView.as_view()),
     path("posts/", PostListView.as_view(), name="coupon-post-list"),
     path("post/<int:id>/", PostDetailView.as_view(), name="store-detail"),
+    path("autocomplete/", StoreAutocompleteView.as_view(), name="store-autocomplete"),
 ]
\ No newline at end of file
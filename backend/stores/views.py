@@ -5,13 +5,20 @@ from rest_framework.response import Response
 from stores.models import Store
 from stores.serializers import StoreUpdateSerializer, PostSerializer, PostDetailSerializer
 from common.response import success, failure
+from config.auth import get_owner_principal
+from common.pagination import KeysetPaginator
+from stores.search import search_posts
+from stores.autocomplete import store_name_index
+from stores.hours import open_at_expression, parse_open_at, week_minute
+from rest_framework.exceptions import ValidationError
 
 
 from rest_framework.generics import ListAPIView
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, filters
+from django.db.models import Prefetch
 from coupons.models import CouponPolicy
-from partnerships.models import Partnership
+from partnerships.models import is_partnered_expression
 from rest_framework.generics import RetrieveAPIView
 
 
@@ -19,10 +26,8 @@ class StoreUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request):
-        user = request.user
-        try:
-            store = Store.objects.get(owner=user)
-        except Store.DoesNotExist:
+        store = get_owner_principal(request).store
+        if store is None:
             return Response(failure(message="가게 정보가 존재하지 않습니다."), status=404)
 
         serializer = StoreUpdateSerializer(store, data=request.data, partial=True)
@@ -44,35 +49,70 @@ class CouponPolicyInlineFilter(FilterSet):
     monthly_limit_max = filters.NumberFilter(field_name="monthly_limit", lookup_expr="lte")
     updated_at = filters.DateFromToRangeFilter(field_name="updated_at")
     is_partnered = filters.CharFilter(method="filter_by_partnership")
+    open_now = filters.BooleanFilter(method="filter_open_now")
+    open_at = filters.CharFilter(method="filter_open_at")  # "19:00"(오늘) 또는 "fri-19:00"
 
     class Meta:
         model = CouponPolicy
         fields = []
 
     def filter_by_partnership(self, queryset, name, value):
-        partner_ids_a = Partnership.objects.filter(status="active").values_list("store_a_id", flat=True)
-        partner_ids_b = Partnership.objects.filter(status="active").values_list("store_b_id", flat=True)
-        partner_ids = set(partner_ids_a) | set(partner_ids_b)
+        # 목록 직렬화와 같은 EXISTS 주석값으로 거른다 (PostListView.queryset 에서 이미 붙어 있음)
+        if "is_partnered" not in queryset.query.annotations:
+            queryset = queryset.annotate(is_partnered=is_partnered_expression("store_id"))
 
         if value.lower() == "true":
-            return queryset.filter(store_id__in=partner_ids)
+            return queryset.filter(is_partnered=True)
         elif value.lower() == "false":
-            return queryset.exclude(store_id__in=partner_ids)
+            return queryset.filter(is_partnered=False)
         return queryset
 
+    # 영업 여부는 컴파일된 주간 영업 구간(StoreOpenInterval) 의 EXISTS 로 판단 (JSON 파싱 없음)
+    def filter_open_now(self, queryset, name, value):
+        if value is None:
+            return queryset
+        return queryset.filter(open_at_expression(week_minute()) if value else ~open_at_expression(week_minute()))
+
+    def filter_open_at(self, queryset, name, value):
+        minute = parse_open_at(value)
+        if minute is None:
+            raise ValidationError({"open_at": "open_at 은 HH:MM 또는 요일-HH:MM(예: fri-19:00) 형식이어야 합니다."})
+        return queryset.filter(open_at_expression(minute))
+
 
 class PostListView(ListAPIView):
     permission_classes = [IsAuthenticated]
-    queryset = CouponPolicy.objects.select_related("store__owner").filter(is_active=True)
+    queryset = CouponPolicy.objects.select_related("store__owner").filter(is_active=True).annotate(
+        is_partnered=is_partnered_expression("store_id")
+    )
     serializer_class = PostSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = CouponPolicyInlineFilter
     ordering_fields = ["updated_at", "expected_value", "monthly_limit"]
     ordering = ["-updated_at"]
 
+    # ?cursor= 가 있으면 커서 모드: (updated_at, id) 키셋, COUNT(*) 없음 (무한 스크롤용)
+    # 없으면 기존 페이지 번호 모드
+    cursor_paginator = KeysetPaginator(ordering=("-updated_at", "-id"), page_size=10)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        # ?q= : 가게명/주소/쿠폰 설명 n-gram 검색, ordering 을 따로 주지 않으면 관련도순
+        q = self.request.query_params.get("q", "").strip()
+        if q:
+            queryset = search_posts(queryset, q, keep_order="ordering" in self.request.query_params)
+        return queryset
+
     def list(self, request, *args, **kwargs):
+        if "cursor" in request.query_params and request.query_params.get("q"):
+            return Response(failure(message="검색 결과는 커서 모드를 지원하지 않습니다."), status=400)
+
         queryset = self.filter_queryset(self.get_queryset())
 
+        if "cursor" in request.query_params:
+            return self.cursor_list(request, queryset)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -81,6 +121,21 @@ class PostListView(ListAPIView):
         serializer = self.get_serializer(queryset, many=True)
         return Response(success(data=serializer.data))
 
+    def cursor_list(self, request, queryset):
+        if request.query_params.get("ordering", "-updated_at") != "-updated_at":
+            return Response(failure(message="커서 모드는 최신순(-updated_at) 정렬만 지원합니다."), status=400)
+
+        try:
+            posts, next_cursor, previous_cursor = self.cursor_paginator.paginate(queryset, request)
+        except ValueError:
+            return Response(failure(message="잘못된 커서입니다."), status=400)
+
+        return Response(success(data={
+            "next": next_cursor,
+            "previous": previous_cursor,
+            "results": self.get_serializer(posts, many=True).data,
+        }))
+
     def get_paginated_response(self, data):
         return Response(success(data={
             "count": self.paginator.page.paginator.count,
@@ -92,7 +147,15 @@ class PostListView(ListAPIView):
 
 class PostDetailView(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
-    queryset = Store.objects.select_related("owner")
+    queryset = Store.objects.select_related("owner").annotate(
+        is_partnered=is_partnered_expression()
+    ).prefetch_related(
+        Prefetch(
+            "coupon_policies",
+            queryset=CouponPolicy.objects.filter(is_active=True),
+            to_attr="active_policies",
+        )
+    )
     serializer_class = PostDetailSerializer
     lookup_field = "id"
 
@@ -103,4 +166,22 @@ class PostDetailView(RetrieveAPIView):
             return Response(failure("존재하지 않는 가게입니다."), status=404)
 
         serializer = self.get_serializer(store)
-        return Response(success(data=serializer.data))
\ No newline at end of file
+        return Response(success(data=serializer.data))
+
+
+class StoreAutocompleteView(APIView):
+    """
+    가게명 자동완성. ?q=빵ㅈ&limit=10 → 프로세스 메모리 색인에서 바로 응답 (DB 조회 없음)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        q = request.query_params.get("q", "")
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 20))
+        except ValueError:
+            limit = 10
+
+        store_name_index.start()  # 적재/재적재는 백그라운드에서
+        return Response(success(data=store_name_index.search(q, limit)))
+